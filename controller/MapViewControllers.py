@@ -169,6 +169,9 @@ class FenceCheckpointController(FenceLoaderController):
     def create_checkpoints(self):
         self._model.create_checkpoints()
 
+    def create_centerline_checkpoints(self):
+        self._model.create_centerline_checkpoints()
+
     def clear_checkpoints(self):
         self._model.clear_checkpoints()
 
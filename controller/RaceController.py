@@ -24,7 +24,13 @@ class RaceController(FenceCheckpointController):
         return self._player_manager.players_list
 
     def get_position(self, player_number: int):
-        pass
+        return self._player_manager.leaderboard.position(player_number)
+
+    def get_ranking(self):
+        return self._player_manager.leaderboard.ranking
+
+    def get_lap_timer(self, player_number: int):
+        return self._player_manager.trackers[player_number].lap_timer
 
     def get_starting_positions(self):
         positions = [seeker.starting_point for _, seeker in self._flight_manager.seekers.items()]
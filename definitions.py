@@ -16,6 +16,9 @@ FENCES_DIR = os.path.join(ROOT_DIR, r'fences')
 # Directory where image assets are stored
 ASSETS_DIR = os.path.join(ROOT_DIR, r'assets')
 
+# Append-only snapshot journal of the race in progress
+RACE_JOURNAL_PATH = os.path.join(ROOT_DIR, r'race.journal')
+
 
 # ____NAMES
 # Name of this application
@@ -38,15 +41,60 @@ EARTH_RADIUS_METERS = 6371E3
 # Minimum separation of a starting point from the nearest checkpoint
 CHECKPOINT_SEPARATION_UNITS = 5
 
-# Separation increment when the above is not met
-CHECKPOINT_SEPARATION_INTERVAL_METERS = 0.1
-
 # Max number of iterations for some loops
 LOOP_CEILING = 10000
 
-# Minimum distance to any checkpoint to count as crossed
+# Fence zone vertices closer than this in both latitude and longitude are the same vertex (None: exact match only)
+FENCE_VERTEX_QUANTIZATION_DEGREES = None
+
+# Gate spacing along the corridor centerline for the centerline checkpoint generator
+CHECKPOINT_SPACING_METERS = 12
+
+# Maximum number of checkpoints the centerline generator may place, widening the spacing if needed
+MAX_CHECKPOINTS = 200
+
+# Sampling step of the inclusion zone boundary when approximating the corridor centerline
+CENTERLINE_SAMPLING_METERS = 0.5
+
+# Cell side of the spatial index over a track's checkpoints
+CHECKPOINT_GRID_CELL_METERS = 5
+
+# Version of the track compiler. Bump it whenever checkpoints, lengths or starting points are generated differently
+COMPILED_TRACK_VERSION = 1
+
+# File suffix of compiled tracks, stored next to their .waypoints fence
+COMPILED_TRACK_SUFFIX = '.compiled.npz'
+
+# Number of compiled tracks kept in memory
+TRACK_CACHE_SIZE = 8
+
+# File name of the track catalog index, stored in the scanned fences directory
+TRACK_CATALOG_FILENAME = '.track_catalog.json'
+
+# Default starting formation for StartingGrid: 'grid' or 'staggered'
+STARTING_GRID_FORMATION = 'staggered'
+
+# Racers side by side in a starting grid row
+STARTING_GRID_COLUMNS = 2
+
+# Distance along the track between starting grid rows
+STARTING_GRID_ROW_SPACING_METERS = 3
+
+# Distance across the track between racers of a starting grid row (half of it is kept from the track borders)
+STARTING_GRID_LATERAL_SPACING_METERS = 2
+
+# Laps preallocated in every racer's timing arrays, doubled when exceeded
+TIMING_LAP_CAPACITY = 32
+
+# Minimum time between two race journal snapshots of the same racer
+RACE_JOURNAL_INTERVAL_SECONDS = 0.5
+
+# Distance to a checkpoint's midpoint that counts as crossed when the drone's motion does not intersect the gate
 CHECKPOINT_CROSSING_THRESHOLD_METERS = 2
 
+# Ground size of a web mercator tile pixel at the equator at zoom level 0 (256 px tiles)
+TILE_METERS_PER_PIXEL = 156543.03392
+
 
 # ____AUTOPILOT
 # Mission Planner's SITL port
@@ -73,8 +121,14 @@ TELEMETRY_BAUD = 57600
 # Default baud rate for SITL and internet connection (global, local)
 DEFAULT_BAUD = 115200
 
-# Player's race heights
-OPERATING_HEIGHTS = [4+(player*2) for player in range(MAX_PLAYERS)]
+# Lowest racing altitude
+OPERATING_HEIGHT_BASE_METERS = 4
+
+# Altitude between consecutive racing layers
+OPERATING_HEIGHT_STEP_METERS = 2
+
+# Maximum number of racing altitude layers, racers share layers beyond that
+OPERATING_HEIGHT_LAYERS = 4
 
 
 # ____TK
@@ -98,3 +152,6 @@ POLYGON_EXCLUSION_KWARGS = {
     'outline_color': '#DD1C1A',
     'border_width': 2,
 }
+
+# Deviation, in screen pixels, below which fence zone vertices are dropped when drawn
+POLYGON_SIMPLIFICATION_PIXELS = 0.5
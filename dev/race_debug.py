@@ -40,18 +40,20 @@ def main2():
     flight_manager = FlightManager(player_manager, track_manager)
     flight_manager.link_autopilot_controller(33)
 
+    player_operating_height = track_manager.race_model.starting_points.operating_heights[-1]
     player_starting_point = track_manager.race_model.starting_points.starting_points.pop()
     player_starting_zone_absolute = track_manager.race_model.starting_points.starting_zones.pop()
-    flight_manager.link_seeker(33, player_starting_point, player_starting_zone_absolute)
+    flight_manager.link_seeker(33, player_starting_point, player_starting_zone_absolute, player_operating_height)
 
     player_manager.link_stopwatch(33)
 
     player_checkpoints = rotate_list(track_manager.race_model.checkpoints, player_starting_zone_absolute)
-    player_zone_lengths = rotate_list(track_manager.race_model.starting_points.track_length.lengths,
+    player_zone_lengths = rotate_list(track_manager.race_model.starting_points.track_length.zone_lengths,
                                       player_starting_zone_absolute)
 
     player_manager.link_tracker(33, flight_manager.autopilot_controllers[33].telemetry_info,
-                                player_checkpoints, player_zone_lengths)
+                                player_checkpoints, player_zone_lengths, track_manager.race_model.map.projection,
+                                track_manager.race_model.checkpoint_grid)
 
     race_manager = RaceManager(player_manager, track_manager, flight_manager)
 
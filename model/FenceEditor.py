@@ -5,6 +5,38 @@ from model.FileEditor import FileEditor
 from model.utils import MavlinkParameters, FenceZone, MissionItem, Vertex
 
 
+class FenceDocument:
+    """
+    A whole .waypoints fence built in memory: header, home item and zone vertices. Item indices are assigned by the
+    document as items are added, and the file is written in one atomic call.
+    """
+    def __init__(self, home: MissionItem):
+        self._items: typing.List[MissionItem] = [home]
+
+    @property
+    def items(self):
+        return self._items
+
+    @property
+    def next_index(self):
+        return len(self._items)
+
+    def add_zone(self, zone: FenceZone):
+        _first_index = self.next_index
+        for _ii_count, _ii_coordinates in enumerate(zone.tuple_list):
+            self._items.append(FenceEditor.zone_item(_ii_coordinates, _first_index + _ii_count, zone.count,
+                                                     _ii_count, zone.type))
+
+    def replace_item(self, index: int, item: MissionItem):
+        self._items[index] = item
+
+    def lines(self) -> typing.List[str]:
+        return [MavlinkParameters.FILE_HEADER + '\n', *(_item.__str__() for _item in self._items)]
+
+    def save(self, file_editor: FileEditor):
+        file_editor.write_file(self.lines())
+
+
 class FenceEditor:
     def __init__(self, filepath: str):
         self._filepath = filepath
@@ -20,16 +52,15 @@ class FenceEditor:
         return self._home
 
     def has_header(self):
-        _header = self._file_editor.readline(0).strip('\n')
-        if _header == MavlinkParameters.FILE_HEADER:
+        _header = self._file_editor.readline(0)
+        if _header is not None and _header.strip('\n') == MavlinkParameters.FILE_HEADER:
             return True
         else:
             return False
 
     def has_home(self):
-        _home_item = self._file_editor.readline(1)
-        _mission_item = MissionItem(fromstr=_home_item)
-        if _mission_item.valid_home():
+        _home_item = self.read_home()
+        if _home_item is not None and _home_item.valid_home():
             return True
         else:
             return False
@@ -52,26 +83,67 @@ class FenceEditor:
 
     def read_home(self) -> typing.Optional[MissionItem]:
         _home_line = self._file_editor.readline(1)
-        if not _home_line:
+        if _home_line is None or not _home_line.strip():
             return None
-        _home_item = MissionItem(fromstr=_home_line)
-        return _home_item
+        return MissionItem(fromstr=_home_line)
 
     def read_zones(self):
-        _ii_index = 2
-        _zones = []
-        _LINE_COUNT = self._file_editor.len
-        while _ii_index < _LINE_COUNT:
-            _line = self._file_editor.readline(_ii_index)
-            _command = MissionItem(fromstr=_line).command
-            if _command == MavlinkParameters.MAV_CMD_NAV_FENCE_POLYGON_VERTEX_EXCLUSION or \
-                    _command == MavlinkParameters.MAV_CMD_NAV_FENCE_POLYGON_VERTEX_INCLUSION:
-                _zone = self._read_zone(_ii_index)
+        return self.read_fence()[2]
+
+    def read_items(self) -> typing.List[MissionItem]:
+        """
+        :return: every item of the file, blank lines and the header excluded
+        """
+        _lines = self._file_editor.read_file()
+        return MissionItem.from_lines(_ii_line for _ii_line in _lines[1:] if _ii_line.strip())
+
+    def read_fence(self) -> typing.Tuple[bool, typing.Optional[MissionItem], typing.List[FenceZone]]:
+        """
+        Parses the whole file in a single streaming pass.
+        Line 0 is the header and line 1 the home item. A zone starts at a fence vertex item and goes on for as long as
+        each item's param7 (its sequence number in the zone) matches its distance from the zone's first line.
+        :return: whether the file has a valid header, the home item (None if missing) and every zone, closed
+        """
+        _has_header = False
+        _home: typing.Optional[MissionItem] = None
+        _zones: typing.List[FenceZone] = []
+
+        _zone: typing.Optional[FenceZone] = None
+        _zone_start = 0
+        for _ii_line_index, _ii_line in enumerate(self._file_editor.lines()):
+            if _ii_line_index == 0:
+                _has_header = _ii_line.strip('\n') == MavlinkParameters.FILE_HEADER
+                continue
+            if not _ii_line.strip():
+                continue
+
+            _item = MissionItem(fromstr=_ii_line)
+            if _ii_line_index == 1:
+                _home = _item
+                continue
+
+            # Next vertex of the zone being read
+            if _zone is not None and _ii_line_index - _item.sequence == _zone_start:
+                _zone.add_vertex(Vertex(*_item.coordinates[:2]))
+                continue
+
+            # Any other item ends it
+            if _zone is not None:
+                _zone.close()
+                _zone = None
+
+            if _item.command == MavlinkParameters.MAV_CMD_NAV_FENCE_POLYGON_VERTEX_EXCLUSION or \
+                    _item.command == MavlinkParameters.MAV_CMD_NAV_FENCE_POLYGON_VERTEX_INCLUSION:
+                _zone = FenceZone()
+                _zone.set_type(_item.command == MavlinkParameters.MAV_CMD_NAV_FENCE_POLYGON_VERTEX_INCLUSION)
+                _zone_start = _ii_line_index
                 _zones.append(_zone)
-                _ii_index += _zone.count
-            else:
-                _ii_index += 1
-        return _zones
+                if _item.sequence == 0:
+                    _zone.add_vertex(Vertex(*_item.coordinates[:2]))
+
+        if _zone is not None:
+            _zone.close()
+        return _has_header, _home, _zones
 
     def write_home(self) -> bool:
         if self._home is not None:
@@ -98,52 +170,22 @@ class FenceEditor:
         for _ii_zone in zones:
             self.write_fence_zone(_ii_zone)
 
+    def write_fence(self, zones: typing.List[FenceZone]) -> bool:
+        """
+        Replaces the file with the header, the home set with set_home and the zones, in a single atomic write.
+        """
+        if self._home is None:
+            return False
+        _document = FenceDocument(self._home)
+        for _ii_zone in zones:
+            _document.add_zone(_ii_zone)
+        _document.save(self._file_editor)
+        return True
+
     def copy_to(self, fence_editor: FenceEditor):
-        _zones = self.read_zones()
-        _home = self.read_home()
-        fence_editor.file_editor.clear_file()
-        fence_editor.write_header()
+        _, _home, _zones = self.read_fence()
         fence_editor.set_home(*_home.coordinates)
-        fence_editor.write_home()
-        fence_editor.write_zones(_zones)
-
-    def _read_zone(self, start_line: int):
-        _ii_line = start_line
-        _ii_item = MissionItem(fromstr=self._file_editor.readline(_ii_line))
-
-        _zone = FenceZone()
-        if _ii_item.command == MavlinkParameters.MAV_CMD_NAV_FENCE_POLYGON_VERTEX_EXCLUSION:
-            _zone_type = False
-        elif _ii_item.command == MavlinkParameters.MAV_CMD_NAV_FENCE_POLYGON_VERTEX_INCLUSION:
-            _zone_type = True
-        else:
-            return None
-        _zone.set_type(_zone_type)
-
-        # TODO: Move if needed elsewhere
-        def force_int(value: str):
-            try:
-                _int = int(value)
-            except ValueError:
-                _int = float(value)
-                _int = int(_int)
-            return _int
-
-        while _ii_line - force_int(_ii_item.params[-1]) == start_line:
-            _lat = float(_ii_item.params[-3])
-            _long = float(_ii_item.params[-2])
-
-            _vertex = Vertex(_lat, _long)
-            _zone.add_vertex(_vertex)
-
-            # End
-            _ii_line += 1
-            _item_str = self._file_editor.readline(_ii_line)
-            if not _item_str:
-                break
-            _ii_item = MissionItem(fromstr=_item_str)
-        _zone.close()
-        return _zone
+        fence_editor.write_fence(_zones)
 
     def _get_next_index(self):
         _last_line = self._file_editor.read_last_line().strip('\n')
@@ -154,23 +196,28 @@ class FenceEditor:
         else:
             return _index
 
-    def _write_waypoint(self, coordinates: typing.Tuple[float, float], index: int, wp_total: int, wp_count: int,
-                        fence_type: bool, overwrite_line: typing.Optional[int] = None):
+    @staticmethod
+    def zone_item(coordinates: typing.Tuple[float, float], index: int, wp_total: int, wp_count: int,
+                  fence_type: bool) -> MissionItem:
         if fence_type is True:
             _command = MavlinkParameters.MAV_CMD_NAV_FENCE_POLYGON_VERTEX_INCLUSION
         else:
             _command = MavlinkParameters.MAV_CMD_NAV_FENCE_POLYGON_VERTEX_EXCLUSION
 
-        _item = MissionItem(fromstr=None, index=str(index), current_wp='0', coord_frame='3', command=_command,
-                            param1=str(wp_total),
-                            param2='0',
-                            param3='0',
-                            param4='0',
-                            param5=str(coordinates[0]),
-                            param6=str(coordinates[1]),
-                            param7=str(wp_count),
-                            autocontinue='1'
-                            )
+        return MissionItem(fromstr=None, index=str(index), current_wp='0', coord_frame='3', command=_command,
+                           param1=str(wp_total),
+                           param2='0',
+                           param3='0',
+                           param4='0',
+                           param5=str(coordinates[0]),
+                           param6=str(coordinates[1]),
+                           param7=str(wp_count),
+                           autocontinue='1'
+                           )
+
+    def _write_waypoint(self, coordinates: typing.Tuple[float, float], index: int, wp_total: int, wp_count: int,
+                        fence_type: bool, overwrite_line: typing.Optional[int] = None):
+        _item = self.zone_item(coordinates, index, wp_total, wp_count, fence_type)
         self._file_editor.writeline(_item.__str__(), overwrite_line)
 
     def _write_item(self, waypoint: MissionItem):
@@ -1,4 +1,7 @@
 import typing
+import os
+
+from model.utils import atomic_write
 
 
 class FileEditor:
@@ -10,24 +13,93 @@ class FileEditor:
         'create': 'x'
     }
 
-    def __init__(self, filepath: str):
+    def __init__(self, filepath: str, cached: bool = False):
+        """
+        :param filepath: path of the file
+        :param cached: keep the file in memory with an index of its line offsets, so readline, read_last_line and len
+        run in O(1). The index is revalidated against the file's modification time and size on every call.
+        """
         self._filepath = filepath
+        self._cached = cached
+
+        # Cached mode: raw content, start offset of every line followed by the end of the last complete line,
+        # and the (mtime, size) the content was read at
+        self._data = bytearray()
+        self._offsets: typing.List[int] = [0]
+        self._signature: typing.Optional[typing.Tuple[int, int]] = None
+
+    @property
+    def cached(self):
+        return self._cached
 
     def _open(self, mode: str):
         _mode = self._mode_dict[mode]
         return open(self._filepath, _mode, encoding=self._encoding)
 
+    def _stat_signature(self) -> typing.Tuple[int, int]:
+        _stat = os.stat(self._filepath)
+        return _stat.st_mtime_ns, _stat.st_size
+
+    def _validate(self):
+        """
+        Reloads the line index if the file changed since it was built.
+        """
+        _signature = self._stat_signature()
+        if _signature == self._signature:
+            return
+        with open(self._filepath, 'rb') as _file:
+            self._data = bytearray(_file.read())
+        self._offsets = [0]
+        self._index_from(0)
+        self._signature = _signature
+
+    def _index_from(self, position: int):
+        _position = self._data.find(b'\n', position)
+        while _position != -1:
+            self._offsets.append(_position + 1)
+            _position = self._data.find(b'\n', _position + 1)
+
+    def _invalidate(self):
+        self._signature = None
+
+    def _line_count(self) -> int:
+        # The content after the last newline, if any, is a line as well
+        return len(self._offsets) - 1 + (len(self._data) > self._offsets[-1])
+
+    def _cached_line(self, line_index: int) -> str:
+        _end = self._offsets[line_index + 1] if line_index + 1 < len(self._offsets) else len(self._data)
+        return self._data[self._offsets[line_index]:_end].decode(self._encoding).replace('\r\n', '\n')
+
     def read_file(self):
+        if self._cached:
+            self._validate()
+            return [self._cached_line(_ii_index) for _ii_index in range(self._line_count())]
         with self._open('read') as _file:
             return _file.readlines()
 
+    def lines(self) -> typing.Iterator[str]:
+        """
+        Streams the file's lines from a single open, without holding them all in memory.
+        """
+        with self._open('read') as _file:
+            yield from _file
+
     def readline(self, line_index: int) -> str:
+        if self._cached:
+            self._validate()
+            if 0 <= line_index < self._line_count():
+                return self._cached_line(line_index)
+            return None
         with self._open('read') as _file:
             for _index, _line in enumerate(_file):
                 if _index == line_index:
                     return _line
 
     def read_last_line(self):
+        if self._cached:
+            self._validate()
+            _count = self._line_count()
+            return self._cached_line(_count - 1) if _count else ''
         with self._open('read') as _file:
             _prev_line = ''
             _line = _file.readline()
@@ -38,21 +110,46 @@ class FileEditor:
 
     def writeline(self, line: str, index: typing.Optional[int] = None):
         if index is None:
+            # An append extends a valid line index in place instead of reloading it
+            _was_valid = self._cached and self._signature is not None and \
+                self._signature == self._stat_signature()
             with self._open('append') as _file:
                 _file.write(line)
+            if _was_valid:
+                _end = len(self._data)
+                self._data += line.encode(self._encoding)
+                self._index_from(_end)
+                self._signature = self._stat_signature()
+            else:
+                self._invalidate()
         else:
-            with self._open('read') as _file:
-                _data = _file.readlines()
+            _data = self.read_file()
 
             _data[index] = line
             with self._open('write') as _file:
                 _file.writelines(_data)
+            self._invalidate()
+
+    def write_file(self, lines: typing.Iterable[str]):
+        """
+        Replaces the whole file in one write. The lines go to a temporary file in the same directory, which is
+        flushed to disk and renamed over the file, so a crash leaves either the old or the new file, never half of it.
+        """
+        try:
+            with atomic_write(self._filepath, self._mode_dict['write'], self._encoding) as _file:
+                _file.write(''.join(lines))
+        finally:
+            self._invalidate()
 
     def clear_file(self):
         self._open('write').close()
+        self._invalidate()
 
     @property
     def len(self):
+        if self._cached:
+            self._validate()
+            return self._line_count()
         with self._open('read') as _file:
             return sum(1 for _ in _file)
 
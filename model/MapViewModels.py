@@ -3,9 +3,11 @@ import numpy as np
 
 from model.BasicModel import BasicModel as _BasicModel
 from model.FenceEditor import FenceEditor as _FenceEditor
-from model.utils import FenceMap, FenceZone, Checkpoint, Vertex
+from model.utils import (FenceMap, FenceZone, CheckpointSet, Vertex, nearest_indices, closest_points_on_polygon,
+                         sample_closed_polyline, polyline_length)
 from model.maps.MapViewElevationRequest import get_elevation as _get_elevation
 from model.maps.MapViewTileServers import get_tile_server as _get_tile_server
+from definitions import CHECKPOINT_SPACING_METERS, MAX_CHECKPOINTS, CENTERLINE_SAMPLING_METERS
 
 
 class BasicMapViewModel(_BasicModel):
@@ -50,14 +52,17 @@ class FenceLoaderModel(_BasicModel):
         # New map instance
         _map = FenceMap()
 
-        # Read and set file's home's coordinates
-        _coordinates = self._file_manager.read_home().coordinates
-        _home_vertex = Vertex(*_coordinates)
+        # Read the whole file in one pass
+        _, _home_item, _zones = self._file_manager.read_fence()
+
+        # Set file's home's coordinates
+        if _home_item is None:
+            return False
+        _home_vertex = Vertex(*_home_item.coordinates)
         if not _map.set_home(_home_vertex):
             return False
 
-        # Read and add file's zones
-        _zones = self._file_manager.read_zones()
+        # Add file's zones
         if len(_zones) != 2:
             return False
         for _ii_zone in _zones:
@@ -192,25 +197,13 @@ class FenceEditorModel(FenceLoaderModel):
         # Open file with FenceEditor
         self._file_manager = _FenceEditor(save_dir)
 
-        # If file already exists, clear it
-        self._file_manager.file_editor.clear_file()
-
-        # Write file header
-        self._file_manager.write_header()
-
         # Get home coordinates and elevation
         _home_lat, _home_lon = self._map.home.tuple
         _home_elevation = _get_elevation(_home_lat, _home_lon)
 
-        # Set and write home
+        # Set home, then write header, home and all zones at once, replacing the file if it already exists
         self._file_manager.set_home(_home_lat, _home_lon, _home_elevation)
-        self._file_manager.write_home()
-
-        # Write all zones
-        self._file_manager.write_zones([self._map.inclusion_zone, self._map.exclusion_zone])
-
-        # Success exit code
-        return True
+        return self._file_manager.write_fence([self._map.inclusion_zone, self._map.exclusion_zone])
 
 
 class FenceCheckpointModel(FenceLoaderModel):
@@ -220,7 +213,7 @@ class FenceCheckpointModel(FenceLoaderModel):
     def __init__(self):
         FenceLoaderModel.__init__(self)
 
-        self._checkpoints: typing.List[Checkpoint] = []
+        self._checkpoints: CheckpointSet = CheckpointSet([])
 
     @property
     def checkpoints(self):
@@ -235,21 +228,49 @@ class FenceCheckpointModel(FenceLoaderModel):
         _exclusion_zone = self._map.exclusion_zone
         _inclusion_zone = self._map.inclusion_zone
 
-        _exclusion_zone_vertices_array = np.array(_exclusion_zone.tuple_list)
-        _checkpoints = []
-
-        for _ii_inclusion_vertex in _inclusion_zone.vertices:
-            _inclusion_vertex_arr = np.array(_ii_inclusion_vertex.tuple)
-            _distances = np.linalg.norm(_exclusion_zone_vertices_array - _inclusion_vertex_arr, axis=1)
-            _min_index = np.argmin(_distances)
-            _a_list: typing.Union[list, object] = _inclusion_vertex_arr.tolist()
-            _b_list: typing.Union[list, object] = _exclusion_zone_vertices_array[_min_index].tolist()
-            _a_vertex = Vertex(_a_list[0], _a_list[1])
-            _b_vertex = Vertex(_b_list[0], _b_list[1])
-            _checkpoint = Checkpoint(_a_vertex, _b_vertex)
-            _checkpoints.append(_checkpoint)
+        # Pair every inclusion vertex with its nearest exclusion vertex in the map's east/north plane (meters),
+        # in a single vectorized pass
+        _projection = self._map.projection
+        _nearest = nearest_indices(_projection.project_zone(_inclusion_zone), _projection.project_zone(_exclusion_zone))
+
+        self._checkpoints = CheckpointSet(np.stack((_inclusion_zone.array, _exclusion_zone.array[_nearest]), axis=1))
+
+    def create_centerline_checkpoints(self, spacing_meters: float = CHECKPOINT_SPACING_METERS,
+                                      max_checkpoints: int = MAX_CHECKPOINTS):
+        """
+        Alternative generator: places gates at a regular spacing along the centerline of the corridor between the
+        inclusion and exclusion zones, instead of at the inclusion zone's vertices. Each gate joins the closest
+        points of both zone boundaries to its centerline point. The spacing is widened if needed so there are never
+        more than max_checkpoints gates.
+        """
+        # Check if map exists
+        if self._map is None:
+            return False
 
-        self._checkpoints = _checkpoints
+        _projection = self._map.projection
+        _inclusion_array = _projection.project_zone(self._map.inclusion_zone)
+        _exclusion_array = _projection.project_zone(self._map.exclusion_zone)
+
+        # Approximate the centerline as the midpoints between the densely sampled inclusion boundary and its closest
+        # points on the exclusion boundary. It starts at the inclusion zone's first vertex and follows its direction.
+        _inclusion_length = polyline_length(_inclusion_array)
+        _sample_count = max(3, int(np.ceil(_inclusion_length / CENTERLINE_SAMPLING_METERS)))
+        _inclusion_samples = sample_closed_polyline(_inclusion_array,
+                                                    np.linspace(0, _inclusion_length, _sample_count, endpoint=False))
+        _centerline = (_inclusion_samples + closest_points_on_polygon(_inclusion_samples, _exclusion_array)) * 0.5
+
+        # Evenly spaced gates along the centerline, bounded in count
+        _centerline_length = polyline_length(_centerline)
+        _gate_count = int(np.clip(round(_centerline_length / spacing_meters), 3, max_checkpoints))
+        _gate_centers = sample_closed_polyline(_centerline,
+                                               np.linspace(0, _centerline_length, _gate_count, endpoint=False))
+
+        _gate_endpoints = np.stack((closest_points_on_polygon(_gate_centers, _inclusion_array),
+                                    closest_points_on_polygon(_gate_centers, _exclusion_array)), axis=1)
+        _lat, _lon = _projection.unproject(_gate_endpoints[..., 0], _gate_endpoints[..., 1])
+
+        self._checkpoints = CheckpointSet(np.stack((_lat, _lon), axis=-1))
+        return True
 
     def clear_checkpoints(self):
-        self._checkpoints = []
+        self._checkpoints = CheckpointSet([])
@@ -0,0 +1,143 @@
+from __future__ import annotations
+import typing
+import mmap
+import warnings
+from contextlib import contextmanager
+
+import numpy as np
+
+from model.utils import MavlinkParameters, MissionItem
+
+
+class MissionReader:
+    """
+    Read-only, memory-mapped reader of .waypoints mission and fence files, for files too large to load line by line.
+    The file is never read into memory as a whole: items are sliced one line at a time from the mapped buffer, and the
+    numeric table is parsed by NumPy's loadtxt straight from it, so memory stays at the size of the result.
+    """
+    _COLUMN_COUNT = 12
+
+    # Columns of the numeric table
+    INDEX = 0
+    CURRENT_WP = 1
+    COORD_FRAME = 2
+    COMMAND = 3
+    PARAM1 = 4
+    PARAM5 = 8
+    PARAM6 = 9
+    PARAM7 = 10
+    AUTOCONTINUE = 11
+
+    def __init__(self, filepath: str):
+        self._filepath = filepath
+
+    @property
+    def filepath(self):
+        return self._filepath
+
+    @contextmanager
+    def _mapped(self) -> typing.Iterator[typing.Optional[mmap.mmap]]:
+        """
+        Maps the file read-only, positioned after the header line. Empty files cannot be mapped and yield None.
+        """
+        with open(self._filepath, 'rb') as _file:
+            try:
+                _buffer = mmap.mmap(_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                yield None
+                return
+            with _buffer:
+                _buffer.readline()
+                yield _buffer
+
+    def has_header(self) -> bool:
+        with open(self._filepath, 'rb') as _file:
+            return _file.readline().rstrip(b'\r\n') == MavlinkParameters.FILE_HEADER.encode()
+
+    def fields(self) -> typing.Iterator[typing.List[str]]:
+        """
+        Fields of every item, in file order. Blank lines are skipped.
+        :return: iterator of [index, current_wp, coord_frame, command, param1, ..., param7, autocontinue]
+        """
+        with self._mapped() as _buffer:
+            if _buffer is None:
+                return
+            _separator = MavlinkParameters.SEPARATOR.encode()
+            _start = _buffer.tell()
+            _size = _buffer.size()
+            while _start < _size:
+                _end = _buffer.find(b'\n', _start)
+                if _end == -1:
+                    _end = _size
+                _line = _buffer[_start:_end].rstrip(b'\r')
+                _start = _end + 1
+                if _line.strip():
+                    yield [_field.decode() for _field in _line.split(_separator)]
+
+    def items(self) -> typing.Iterator[MissionItem]:
+        for _ii_fields in self.fields():
+            yield MissionItem(None, *_ii_fields)
+
+    def table(self) -> np.ndarray:
+        """
+        Every item as a row of floats, see the column constants.
+        :return: (N, 12) array
+        :raise ValueError: an item is not 12 numeric fields
+        """
+        with self._mapped() as _buffer:
+            if _buffer is None:
+                return np.empty((0, self._COLUMN_COUNT))
+            # loadtxt reads from the line iterator in chunks, the mapped lines are never held all at once
+            with warnings.catch_warnings():
+                # A file without items is not worth a warning, it gives an empty table
+                warnings.simplefilter('ignore', UserWarning)
+                _table = np.loadtxt(iter(_buffer.readline, b''), delimiter=MavlinkParameters.SEPARATOR, ndmin=2,
+                                    encoding='utf-8')
+        if _table.size == 0:
+            return np.empty((0, self._COLUMN_COUNT))
+        if _table.shape[1] != self._COLUMN_COUNT:
+            raise ValueError(f'{self._filepath} items have {_table.shape[1]} fields, expected {self._COLUMN_COUNT}')
+        return _table
+
+    def coordinates(self) -> np.ndarray:
+        """
+        :return: (N, 3) latitude, longitude and param7 (altitude of waypoints) of every item
+        """
+        return self.table()[:, self.PARAM5:self.PARAM7 + 1]
+
+    def fence_zones(self, table: typing.Optional[np.ndarray] = None) -> typing.List[typing.Tuple[bool, np.ndarray]]:
+        """
+        Fence zones, as runs of consecutive fence vertex items whose param7 counts 0, 1, 2... from the first of them.
+        The first item is the home item and is never part of a zone.
+        :param table: the file's table, if already parsed
+        :return: (True for an inclusion zone, (K, 2) latitude and longitude of its vertices) of every zone
+        """
+        if table is None:
+            table = self.table()
+        _inclusion = float(MavlinkParameters.MAV_CMD_NAV_FENCE_POLYGON_VERTEX_INCLUSION)
+        _exclusion = float(MavlinkParameters.MAV_CMD_NAV_FENCE_POLYGON_VERTEX_EXCLUSION)
+
+        _rows = np.arange(len(table))
+        _vertices = np.flatnonzero(np.isin(table[:, self.COMMAND], (_inclusion, _exclusion)) & (_rows > 0))
+        # Row of the zone's first vertex, according to each vertex's sequence number
+        _zone_start = _rows - table[:, self.PARAM7]
+
+        # A run breaks after any other item, or where a vertex claims a different first vertex than the previous one
+        _breaks = np.flatnonzero((np.diff(_vertices) != 1) | (np.diff(_zone_start[_vertices]) != 0)) + 1
+
+        _zones = []
+        for _ii_run in np.split(_vertices, _breaks) if len(_vertices) else []:
+            if _zone_start[_ii_run[0]] == _ii_run[0]:
+                _zones.append((bool(table[_ii_run[0], self.COMMAND] == _inclusion),
+                               table[_ii_run, self.PARAM5:self.PARAM6 + 1]))
+        return _zones
+
+
+if __name__ == '__main__':
+    import os
+    from definitions import FENCES_DIR
+
+    _missions_dir = os.path.join(FENCES_DIR, 'missions')
+    for _name in sorted(os.listdir(_missions_dir)):
+        _reader = MissionReader(os.path.join(_missions_dir, _name))
+        print(_name, _reader.has_header(), _reader.table().shape)
@@ -0,0 +1,159 @@
+from __future__ import annotations
+import typing
+import struct
+import zlib
+from time import perf_counter, time
+from threading import Lock
+
+from model.utils import Tracker
+from definitions import RACE_JOURNAL_PATH, RACE_JOURNAL_INTERVAL_SECONDS
+
+
+class RaceJournal:
+    """
+    Append-only binary journal of every racer's tracking state, so a restarted ground station can resume a race
+    without re-seeking the starting points.
+    The file starts with a magic header, followed by records of: payload length, payload CRC-32, racer id, wall clock
+    and perf_counter readings at write time, and the racer's Tracker.pack_state payload. The last valid record of each
+    racer wins; a torn record at the end (crash while writing) is ignored.
+    Every racer journals from its own telemetry thread, so records are written whole, one at a time, under a lock.
+    """
+    # Bumped whenever Tracker.pack_state changes, older journals are then ignored
+    _MAGIC = b'FDRJ\x03\x00'
+    _RECORD_HEADER = struct.Struct('<IIidd')
+
+    def __init__(self, path: str = RACE_JOURNAL_PATH, interval: float = RACE_JOURNAL_INTERVAL_SECONDS):
+        self._path = path
+        self._interval = interval
+        self._file: typing.Optional[typing.BinaryIO] = None
+        self._last_write: typing.Dict[int, float] = {}
+        self._last_zone: typing.Dict[int, typing.Tuple[int, int]] = {}
+        self._lock = Lock()
+
+    @property
+    def path(self):
+        return self._path
+
+    def start(self):
+        """
+        Starts a new journal, discarding the previous race's.
+        """
+        with self._lock:
+            self._start()
+
+    def _start(self):
+        self._close()
+        self._file = open(self._path, 'wb')
+        self._file.write(self._MAGIC)
+        self._file.flush()
+        self._last_write = {}
+        self._last_zone = {}
+
+    def resume(self):
+        """
+        Keeps appending to the existing journal, e.g. after restoring from it.
+        """
+        with self._lock:
+            self._close()
+            _latest, _valid_length = self._scan()
+            if not _valid_length:
+                self._start()
+                return
+            # Drop a torn record at the end, records appended after it would be unreadable
+            self._file = open(self._path, 'r+b')
+            self._file.truncate(_valid_length)
+            self._file.seek(_valid_length)
+            self._last_write = {}
+            self._last_zone = {}
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def _close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def append(self, racer_id: int, tracker: Tracker):
+        with self._lock:
+            self._append(racer_id, tracker)
+
+    def _append(self, racer_id: int, tracker: Tracker):
+        if self._file is None:
+            return
+        _payload = tracker.pack_state()
+        # A single write of the whole record, records of different racers never interleave
+        self._file.write(self._RECORD_HEADER.pack(len(_payload), zlib.crc32(_payload), racer_id, time(),
+                                                  perf_counter()) + _payload)
+        # Flushed to the OS, so the record survives a crash of this process
+        self._file.flush()
+        self._last_write[racer_id] = perf_counter()
+        self._last_zone[racer_id] = (tracker.lap, tracker.zone)
+
+    def record(self, racer_id: int, tracker: Tracker):
+        """
+        Appends the racer's state if it crossed a checkpoint since its last record, or if that record is older than
+        the journal interval.
+        """
+        with self._lock:
+            if self._last_zone.get(racer_id) != (tracker.lap, tracker.zone) or \
+                    perf_counter() - self._last_write.get(racer_id, -self._interval) >= self._interval:
+                self._append(racer_id, tracker)
+
+    def progress_callback(self, racer_id: int) -> typing.Callable[[Tracker], None]:
+        """
+        :return: callback for Tracker.register_progress_callback that journals the racer on its ticks
+        """
+        return lambda tracker: self.record(racer_id, tracker)
+
+    def read_latest(self) -> typing.Dict[int, typing.Tuple[bytes, float]]:
+        """
+        Last valid record of every racer.
+        :return: racer id -> (Tracker.pack_state payload, time shift from the writer's clock to this process' clock)
+        """
+        return self._scan()[0]
+
+    def _scan(self) -> typing.Tuple[typing.Dict[int, typing.Tuple[bytes, float]], int]:
+        """
+        :return: last valid record of every racer, and the length of the journal up to its last valid record
+        (0 if the file is missing or is not a journal)
+        """
+        try:
+            with open(self._path, 'rb') as _file:
+                _data = _file.read()
+        except OSError:
+            return {}, 0
+        if not _data.startswith(self._MAGIC):
+            return {}, 0
+
+        # Readings of the wall clock and perf_counter at the same instant map perf_counter times across processes
+        _clock_offset = perf_counter() - time()
+
+        _latest = {}
+        _offset = len(self._MAGIC)
+        while _offset + self._RECORD_HEADER.size <= len(_data):
+            _length, _crc, _racer_id, _wall_time, _perf_time = self._RECORD_HEADER.unpack_from(_data, _offset)
+            _start = _offset + self._RECORD_HEADER.size
+            _payload = _data[_start:_start + _length]
+            if len(_payload) != _length or zlib.crc32(_payload) != _crc:
+                break
+            _latest[_racer_id] = (_payload, _clock_offset + _wall_time - _perf_time)
+            _offset = _start + _length
+        return _latest, _offset
+
+    def restore(self, trackers: typing.Dict[int, Tracker]) -> typing.List[int]:
+        """
+        Restores every tracker that has a record in the journal.
+        :return: ids of the restored racers
+        """
+        _restored = []
+        for _racer_id, (_payload, _time_shift) in self.read_latest().items():
+            if _racer_id in trackers:
+                trackers[_racer_id].unpack_state(_payload, time_shift=_time_shift)
+                _restored.append(_racer_id)
+        return _restored
+
+
+if __name__ == '__main__':
+    pass
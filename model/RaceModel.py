@@ -1,7 +1,8 @@
-from typing import Optional
+from typing import Optional, Tuple
 
 from model.MapViewModels import FenceCheckpointModel
-from model.utils import TrackLength, StartingPoints
+from model.TrackCache import CompiledTrack
+from model.utils import TrackLength, StartingPoints, StartingGrid, CheckpointGrid, CheckpointSet
 
 
 class RaceModel(FenceCheckpointModel):
@@ -14,15 +15,46 @@ class RaceModel(FenceCheckpointModel):
         self._track_length: Optional[TrackLength] = None
         self._starting_points: Optional[StartingPoints] = None
 
+        # Checkpoints the grid was built for, and the grid
+        self._checkpoint_grid: Optional[Tuple[CheckpointSet, CheckpointGrid]] = None
+
     @property
     def starting_points(self):
         return self._starting_points
 
+    @property
+    def checkpoint_grid(self) -> CheckpointGrid:
+        """
+        Spatial index of the track's checkpoints in the map's projection, built once per track and shared by every
+        racer's Tracker.
+        """
+        if self._checkpoint_grid is None or self._checkpoint_grid[0] is not self._checkpoints:
+            _endpoints = self._map.projection.project_checkpoints(self._checkpoints)
+            self._checkpoint_grid = (self._checkpoints, CheckpointGrid(_endpoints))
+        return self._checkpoint_grid[1]
+
     def create_track_length(self):
         self._track_length = TrackLength(self.checkpoints)
 
-    def create_starting_points(self, player_count: int):
-        self._starting_points = StartingPoints(self._track_length, player_count)
+    def create_starting_points(self, player_count: int, formation: Optional[str] = None):
+        """
+        :param formation: None spreads racers evenly around the lap, 'grid' or 'staggered' lines them up in a
+        StartingGrid
+        """
+        if formation is None:
+            self._starting_points = StartingPoints(self._track_length, player_count)
+        else:
+            self._starting_points = StartingGrid(self._track_length, player_count, formation)
+
+    def load_compiled_track(self, compiled_track: CompiledTrack, player_count: int, formation: Optional[str] = None):
+        """
+        Same state as open_map_from_file, create_checkpoints, create_track_length and create_starting_points, taken
+        from a compiled track instead of being generated again.
+        """
+        self._map = compiled_track.fence_map()
+        self._checkpoints = compiled_track.checkpoints()
+        self._track_length = compiled_track.track_length()
+        self._starting_points = compiled_track.starting_points(player_count, self._track_length, formation)
 
 
 if __name__ == '__main__':
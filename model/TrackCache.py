@@ -0,0 +1,265 @@
+from __future__ import annotations
+import typing
+import os
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+from model.MapViewModels import FenceCheckpointModel
+from model.utils import CheckpointSet, TrackLength, StartingPoints, StartingGrid, FenceMap, FenceZone, Vertex, \
+    atomic_write
+from definitions import COMPILED_TRACK_VERSION, COMPILED_TRACK_SUFFIX, TRACK_CACHE_SIZE
+
+
+class CompiledTrack:
+    """
+    Everything select_track derives from a fence file, as plain arrays: the fence itself, the checkpoints, the
+    cumulative track lengths and the starting points for every player count and formation solved so far.
+    It is identified by the SHA-256 of the fence file's content and the compiler version that produced it.
+    """
+    def __init__(self, source_hash: str, version: int, home: np.ndarray, inclusion: np.ndarray,
+                 exclusion: np.ndarray, endpoints: np.ndarray, lengths: np.ndarray,
+                 starts: typing.Optional[typing.Dict[typing.Tuple[int, typing.Optional[str]],
+                                                     typing.Tuple[np.ndarray, np.ndarray, int]]] = None):
+        self._source_hash = source_hash
+        self._version = version
+
+        self._home = home                   # (3,) lat, lon, elevation (NaN if unknown)
+        self._inclusion = inclusion         # (N, 2) lat, lon
+        self._exclusion = exclusion         # (M, 2) lat, lon
+        self._endpoints = endpoints         # (K, 2, 2) checkpoint endpoints
+        self._lengths = lengths             # (K + 1,) cumulative lengths
+
+        # (player count, formation or None) -> (starting points (P, 2), starting zones (P,), grid columns or 0)
+        self._starts = starts if starts is not None else {}
+
+        # True when starting points were solved after the last save
+        self._dirty = False
+
+    @property
+    def source_hash(self):
+        return self._source_hash
+
+    @property
+    def version(self):
+        return self._version
+
+    @property
+    def home(self):
+        return self._home
+
+    @property
+    def inclusion(self):
+        return self._inclusion
+
+    @property
+    def exclusion(self):
+        return self._exclusion
+
+    @property
+    def endpoints(self):
+        return self._endpoints
+
+    @property
+    def lengths(self):
+        return self._lengths
+
+    @property
+    def dirty(self):
+        return self._dirty
+
+    @property
+    def player_counts(self):
+        return sorted({_count for _count, _ in self._starts})
+
+    @classmethod
+    def compile(cls, filepath: str, source_hash: str) -> CompiledTrack:
+        """
+        Runs the full pipeline on a fence file: parse, checkpoint generation and track lengths.
+        """
+        _model = FenceCheckpointModel()
+        if not _model.open_map_from_file(filepath):
+            raise ValueError(f'{filepath} is not a valid fence file')
+        _model.create_checkpoints()
+
+        _map = _model.map
+        _checkpoints = _model.checkpoints
+        _track_length = TrackLength(_checkpoints)
+
+        _elevation = _map.home.elevation
+        _home = np.array([_map.home.lat, _map.home.lon, np.nan if _elevation is None else _elevation])
+
+        return cls(source_hash, COMPILED_TRACK_VERSION, _home, np.array(_map.inclusion_zone.array),
+                   np.array(_map.exclusion_zone.array), np.array(_checkpoints.endpoints),
+                   np.array(_track_length.lengths))
+
+    def fence_map(self) -> FenceMap:
+        _elevation = float(self._home[2])
+        _home = Vertex(float(self._home[0]), float(self._home[1]), None if np.isnan(_elevation) else _elevation)
+
+        _map = FenceMap()
+        _map.set_home(_home)
+        _map.set_inclusion_zone(self._zone(self._inclusion, True))
+        _map.set_exclusion_zone(self._zone(self._exclusion, False))
+        return _map
+
+    @staticmethod
+    def _zone(coordinates: np.ndarray, zone_type: bool) -> FenceZone:
+        _zone = FenceZone()
+        for _lat, _lon in coordinates.tolist():
+            _zone.add_vertex(Vertex(_lat, _lon))
+        _zone.close()
+        _zone.set_type(zone_type)
+        return _zone
+
+    def checkpoints(self) -> CheckpointSet:
+        return CheckpointSet(self._endpoints)
+
+    def track_length(self) -> TrackLength:
+        return TrackLength(self.checkpoints(), self._lengths)
+
+    def starting_points(self, player_count: int, track_length: typing.Optional[TrackLength] = None,
+                        formation: typing.Optional[str] = None) -> StartingPoints:
+        """
+        Starting points for player_count racers, solved and stored in the artifact on first request.
+        :param formation: None spreads racers evenly around the lap, 'grid' or 'staggered' lines them up in a
+        StartingGrid
+        :raise ValueError: no valid placement exists for player_count racers
+        """
+        if track_length is None:
+            track_length = self.track_length()
+
+        _key = (player_count, formation)
+        if _key not in self._starts:
+            if formation is None:
+                _starting_points = StartingPoints(track_length, player_count)
+                _columns = 0
+            else:
+                _starting_points = StartingGrid(track_length, player_count, formation)
+                _columns = _starting_points.columns
+            self._starts[_key] = (
+                np.array([_vertex.tuple for _vertex in _starting_points.starting_points], dtype=np.float64),
+                np.array(_starting_points.starting_zones, dtype=np.int64),
+                _columns
+            )
+            self._dirty = True
+            return _starting_points
+
+        _points, _zones, _columns = self._starts[_key]
+        if formation is None:
+            return StartingPoints.from_arrays(track_length, _points, _zones)
+        return StartingGrid.from_arrays(track_length, _points, _zones, formation, _columns)
+
+    @staticmethod
+    def _start_name(player_count: int, formation: typing.Optional[str]) -> str:
+        return str(player_count) if formation is None else f'{player_count}_{formation}'
+
+    def save(self, path: str):
+        """
+        Writes the artifact atomically: to a temporary file in the same directory, then renamed over path.
+        """
+        _arrays = {
+            'version': np.array(self._version),
+            'source_hash': np.array(self._source_hash),
+            'home': self._home,
+            'inclusion': self._inclusion,
+            'exclusion': self._exclusion,
+            'endpoints': self._endpoints,
+            'lengths': self._lengths,
+        }
+        for (_ii_count, _ii_formation), (_ii_points, _ii_zones, _ii_columns) in self._starts.items():
+            _name = self._start_name(_ii_count, _ii_formation)
+            _arrays[f'start_points_{_name}'] = _ii_points
+            _arrays[f'start_zones_{_name}'] = _ii_zones
+            _arrays[f'start_columns_{_name}'] = np.array(_ii_columns)
+
+        with atomic_write(path, 'wb') as _file:
+            np.savez(_file, **_arrays)
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: str) -> CompiledTrack:
+        with np.load(path, allow_pickle=False) as _file:
+            _starts = {}
+            for _ii_name in _file.files:
+                if _ii_name.startswith('start_points_'):
+                    # <player count> or <player count>_<formation>
+                    _name = _ii_name[len('start_points_'):]
+                    _count, _, _formation = _name.partition('_')
+                    _columns = int(_file[f'start_columns_{_name}']) if f'start_columns_{_name}' in _file.files else 0
+                    _starts[(int(_count), _formation or None)] = (_file[_ii_name], _file[f'start_zones_{_name}'],
+                                                                  _columns)
+
+            return cls(str(_file['source_hash']), int(_file['version']), _file['home'], _file['inclusion'],
+                       _file['exclusion'], _file['endpoints'], _file['lengths'], _starts)
+
+
+class TrackCache:
+    """
+    Compiled tracks, looked up by fence file. Recently used tracks are held in memory (LRU) and every compiled track
+    is persisted next to its fence as <fence><COMPILED_TRACK_SUFFIX>. An artifact is only reused if both the content
+    hash of the fence file and the compiler version match, so editing a fence or the compiler invalidates it.
+    """
+    def __init__(self, max_entries: int = TRACK_CACHE_SIZE):
+        self._max_entries = max_entries
+        self._entries: OrderedDict[typing.Tuple[str, int], CompiledTrack] = OrderedDict()
+
+    @staticmethod
+    def artifact_path(filepath: str) -> str:
+        return os.path.splitext(filepath)[0] + COMPILED_TRACK_SUFFIX
+
+    @staticmethod
+    def content_hash(filepath: str) -> str:
+        with open(filepath, 'rb') as _file:
+            return hashlib.sha256(_file.read()).hexdigest()
+
+    def get(self, filepath: str) -> CompiledTrack:
+        _source_hash = self.content_hash(filepath)
+        _key = (_source_hash, COMPILED_TRACK_VERSION)
+
+        # In-process hit
+        _compiled = self._entries.get(_key)
+        if _compiled is not None:
+            self._entries.move_to_end(_key)
+            return _compiled
+
+        # On-disk hit, or compile and persist
+        _compiled = self._load_artifact(filepath, _key)
+        if _compiled is None:
+            _compiled = CompiledTrack.compile(filepath, _source_hash)
+            self.persist(_compiled, filepath)
+
+        self._entries[_key] = _compiled
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return _compiled
+
+    def persist(self, compiled: CompiledTrack, filepath: str):
+        """
+        Saves the artifact next to its fence. The cache keeps working in memory if the directory is not writable.
+        """
+        try:
+            compiled.save(self.artifact_path(filepath))
+        except OSError as _error:
+            print(f'Compiled track for {filepath} not saved: {_error}')
+
+    def _load_artifact(self, filepath: str, key: typing.Tuple[str, int]) -> typing.Optional[CompiledTrack]:
+        _path = self.artifact_path(filepath)
+        if not os.path.isfile(_path):
+            return None
+        try:
+            _compiled = CompiledTrack.load(_path)
+        except (OSError, ValueError, KeyError) as _error:
+            print(f'Discarding unreadable compiled track {_path}: {_error}')
+            return None
+        if (_compiled.source_hash, _compiled.version) != key:
+            return None
+        return _compiled
+
+    def clear(self):
+        self._entries.clear()
+
+
+if __name__ == '__main__':
+    pass
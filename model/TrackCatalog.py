@@ -0,0 +1,188 @@
+from __future__ import annotations
+import typing
+import os
+import json
+
+import numpy as np
+
+from model.TrackCache import TrackCache, CompiledTrack
+from model.utils import atomic_write
+from definitions import FENCES_DIR, TRACK_CATALOG_FILENAME
+
+
+class TrackInfo:
+    """
+    Metadata of a circuit file, enough to list and preview it without parsing it again.
+    """
+    __slots__ = ('_name', '_size', '_mtime_ns', '_bounds', '_track_length', '_checkpoint_count',
+                 '_inclusion_vertex_count', '_exclusion_vertex_count', '_home', '_elevation')
+
+    def __init__(self, name: str, size: int, mtime_ns: int, bounds: typing.Sequence[float], track_length: float,
+                 checkpoint_count: int, inclusion_vertex_count: int, exclusion_vertex_count: int,
+                 home: typing.Sequence[float], elevation: typing.Optional[float]):
+        self._name = name
+        self._size = size
+        self._mtime_ns = mtime_ns
+        self._bounds = tuple(bounds)  # min lat, min lon, max lat, max lon
+        self._track_length = track_length
+        self._checkpoint_count = checkpoint_count
+        self._inclusion_vertex_count = inclusion_vertex_count
+        self._exclusion_vertex_count = exclusion_vertex_count
+        self._home = tuple(home)
+        self._elevation = elevation
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def mtime_ns(self):
+        return self._mtime_ns
+
+    @property
+    def bounds(self):
+        return self._bounds
+
+    @property
+    def track_length(self):
+        return self._track_length
+
+    @property
+    def checkpoint_count(self):
+        return self._checkpoint_count
+
+    @property
+    def inclusion_vertex_count(self):
+        return self._inclusion_vertex_count
+
+    @property
+    def exclusion_vertex_count(self):
+        return self._exclusion_vertex_count
+
+    @property
+    def home(self):
+        return self._home
+
+    @property
+    def elevation(self):
+        return self._elevation
+
+    @classmethod
+    def from_compiled_track(cls, name: str, stat: os.stat_result, compiled_track: CompiledTrack) -> TrackInfo:
+        _coordinates = np.concatenate((compiled_track.inclusion, compiled_track.exclusion))
+        _bounds = np.concatenate((_coordinates.min(axis=0), _coordinates.max(axis=0))).tolist()
+        _lat, _lon, _elevation = compiled_track.home.tolist()
+        return cls(name, stat.st_size, stat.st_mtime_ns, _bounds, float(compiled_track.lengths[-1]),
+                   len(compiled_track.endpoints), len(compiled_track.inclusion), len(compiled_track.exclusion),
+                   (_lat, _lon), None if np.isnan(_elevation) else _elevation)
+
+    @classmethod
+    def from_dict(cls, name: str, entry: dict) -> TrackInfo:
+        return cls(name, **entry)
+
+    def to_dict(self) -> dict:
+        return {_slot.lstrip('_'): getattr(self, _slot) for _slot in self.__slots__ if _slot != '_name'}
+
+    def matches(self, stat: os.stat_result) -> bool:
+        return self._size == stat.st_size and self._mtime_ns == stat.st_mtime_ns
+
+    def __str__(self):
+        return f'TrackInfo(name: {self._name}, length: {self._track_length:.1f} m, ' \
+               f'checkpoints: {self._checkpoint_count})'
+
+
+class TrackCatalog:
+    """
+    Metadata of every .waypoints circuit in a directory, persisted as a JSON index next to the circuits.
+    An entry is reused while its file keeps the same size and modification time, so a refresh only parses the
+    circuits that changed. Circuits are parsed through the TrackCache, pass TrackManager.get_track_cache() to warm
+    the one select_track uses.
+    """
+    def __init__(self, directory: str = FENCES_DIR, track_cache: typing.Optional[TrackCache] = None):
+        self._directory = directory
+        self._index_path = os.path.join(directory, TRACK_CATALOG_FILENAME)
+        self._track_cache = track_cache if track_cache is not None else TrackCache()
+
+        self._tracks: typing.Dict[str, TrackInfo] = {}
+        # Size and modification time of the circuits that failed to parse, not parsed again until they change
+        self._failures: typing.Dict[str, typing.Tuple[int, int]] = {}
+
+    @property
+    def directory(self):
+        return self._directory
+
+    @property
+    def tracks(self) -> typing.List[TrackInfo]:
+        return [self._tracks[_name] for _name in sorted(self._tracks)]
+
+    @property
+    def track_names(self) -> typing.List[str]:
+        return sorted(self._tracks)
+
+    def get(self, track_name: str) -> typing.Optional[TrackInfo]:
+        return self._tracks.get(track_name)
+
+    def refresh(self) -> typing.List[TrackInfo]:
+        """
+        Scans the directory, re-parsing only new or modified circuits, and saves the index if anything changed.
+        Circuits that fail to parse, for whatever reason, are left out until their file changes.
+        :return: every circuit, sorted by file name
+        """
+        _indexed = self._load_index()
+        _tracks: typing.Dict[str, TrackInfo] = {}
+        _failures: typing.Dict[str, typing.Tuple[int, int]] = {}
+        _changed = False
+
+        for _ii_entry in os.scandir(self._directory):
+            if not _ii_entry.is_file() or not _ii_entry.name.endswith('.waypoints'):
+                continue
+            _stat = _ii_entry.stat()
+
+            _info = _indexed.get(_ii_entry.name)
+            if _info is None or not _info.matches(_stat):
+                _file_id = (_stat.st_size, _stat.st_mtime_ns)
+                if self._failures.get(_ii_entry.name) == _file_id:
+                    _failures[_ii_entry.name] = _file_id
+                    continue
+                try:
+                    _compiled_track = self._track_cache.get(_ii_entry.path)
+                except Exception as _error:
+                    print(f'Skipping {_ii_entry.name}: {_error}')
+                    _failures[_ii_entry.name] = _file_id
+                    continue
+                _info = TrackInfo.from_compiled_track(_ii_entry.name, _stat, _compiled_track)
+                _changed = True
+            _tracks[_ii_entry.name] = _info
+
+        if _changed or _tracks.keys() != _indexed.keys():
+            self._save_index(_tracks)
+        self._tracks = _tracks
+        self._failures = _failures
+        return self.tracks
+
+    def _load_index(self) -> typing.Dict[str, TrackInfo]:
+        try:
+            with open(self._index_path, 'r') as _file:
+                _index = json.load(_file)
+            return {_name: TrackInfo.from_dict(_name, _entry) for _name, _entry in _index.items()}
+        except (OSError, ValueError, TypeError) as _error:
+            if os.path.exists(self._index_path):
+                print(f'Discarding unreadable track catalog {self._index_path}: {_error}')
+            return {}
+
+    def _save_index(self, tracks: typing.Dict[str, TrackInfo]):
+        _index = {_name: tracks[_name].to_dict() for _name in sorted(tracks)}
+        try:
+            with atomic_write(self._index_path) as _file:
+                json.dump(_index, _file, indent=1)
+        except OSError as _error:
+            print(f'Track catalog not saved: {_error}')
+
+
+if __name__ == '__main__':
+    for _track in TrackCatalog().refresh():
+        print(_track)
@@ -1,10 +1,9 @@
-from typing import Dict, Callable
+from typing import Dict, Callable, Optional
 
 from model.managers.PlayerManager import PlayerManager
 from model.managers.TrackManager import TrackManager
 from model.services.MQTTMessageHandler import AutopilotServiceController
-from model.utils import Seeker, Vertex
-from definitions import OPERATING_HEIGHTS
+from model.utils import Seeker, Vertex, operating_heights
 
 
 class FlightManager:
@@ -15,7 +14,6 @@ class FlightManager:
 
         self._autopilot_controllers: Dict[int, AutopilotServiceController] = {}
         self._operating_heights: Dict[int, float] = {}
-        self._operating_heights_list = OPERATING_HEIGHTS.copy()
         self._seekers: Dict[int, Seeker] = {}
 
     @property
@@ -34,8 +32,12 @@ class FlightManager:
             self._autopilot_controllers[player_number]
         )
 
-    def link_seeker(self, player_number: int, starting_point: Vertex, starting_zone_absolute: int):
-        self._operating_heights[player_number] = self._operating_heights_list.pop()
+    def link_seeker(self, player_number: int, starting_point: Vertex, starting_zone_absolute: int,
+                    operating_height: Optional[float] = None):
+        # Without an explicit height (e.g. from StartingPoints.operating_heights), take the next altitude layer
+        if operating_height is None:
+            operating_height = float(operating_heights(len(self._operating_heights) + 1)[-1])
+        self._operating_heights[player_number] = operating_height
 
         self._seekers[player_number] = Seeker(starting_point, starting_zone_absolute,
                                               self._autopilot_controllers[player_number],
@@ -1,6 +1,6 @@
-from typing import Dict, Union, List
+from typing import Dict, Union, List, Optional
 
-from model.utils import Racer, Stopwatch, Tracker, Telemetry, Checkpoint
+from model.utils import Racer, Stopwatch, Tracker, Telemetry, Checkpoint, TrackProjection, Leaderboard, CheckpointGrid
 from model.managers.CommsManager import CommsManager
 from model.services.CommunicationModeHandler import CommunicationModeHandler
 from definitions import APPLICATION_NAME
@@ -14,6 +14,7 @@ class PlayerManager:
         self._communication_handlers: Dict[int, CommunicationModeHandler] = {}
         self._stopwatches: Dict[int, Stopwatch] = {}
         self._trackers: Dict[int, Tracker] = {}
+        self._leaderboard: Leaderboard = Leaderboard()
 
     def link_stopwatch(self, player_number: int):
         self._stopwatches[player_number] = Stopwatch()
@@ -23,8 +24,16 @@ class PlayerManager:
         )
 
     def link_tracker(self, player_number: int, telemetry_info: Telemetry, checkpoints: List[Checkpoint],
-                     zone_lengths: List[float]):
-        self._trackers[player_number] = Tracker(telemetry_info, checkpoints, zone_lengths)
+                     zone_lengths: List[float], projection: Optional[TrackProjection] = None,
+                     checkpoint_grid: Optional[CheckpointGrid] = None):
+        self._trackers[player_number] = Tracker(telemetry_info, checkpoints, zone_lengths, projection,
+                                                checkpoint_grid=checkpoint_grid)
+
+        # Keep the leaderboard up to date with every tracker tick
+        self._trackers[player_number].register_progress_callback(
+            lambda tracker: self._leaderboard.update(player_number, tracker.ranking_key)
+        )
+        self._leaderboard.update(player_number, self._trackers[player_number].ranking_key)
 
         self.players[player_number].set_tracker(
             self._trackers[player_number]
@@ -46,6 +55,10 @@ class PlayerManager:
     def trackers(self):
         return self._trackers
 
+    @property
+    def leaderboard(self):
+        return self._leaderboard
+
     def add_player(self, racer_number: int, icon_color: str):
         self._players[racer_number] = Racer(racer_number, icon_color)
 
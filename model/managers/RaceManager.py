@@ -4,6 +4,8 @@ from time import sleep
 from model.managers.PlayerManager import PlayerManager
 from model.managers.TrackManager import TrackManager
 from model.managers.FlightManager import FlightManager
+from model.utils import GeofenceMonitor
+from model.RaceJournal import RaceJournal
 from controller.RaceController import RaceController
 from view.frames.maps.RaceViewFrame import RaceViewFrame
 
@@ -18,11 +20,21 @@ class RaceManager:
                                                                self._track_manager,
                                                                self._flight_manager)
         self._race_view: Optional[RaceViewFrame] = None
+        self._geofence_monitor: Optional[GeofenceMonitor] = None
+        self._race_journal: RaceJournal = RaceJournal()
 
     @property
     def race_controller(self):
         return self._race_controller
 
+    @property
+    def geofence_monitor(self):
+        return self._geofence_monitor
+
+    @property
+    def race_journal(self):
+        return self._race_journal
+
     def start_race_sequence(self):
         print('STARTING RACE, PLEASE HOLD...')
         for player_number in self._player_manager.players:
@@ -37,8 +49,44 @@ class RaceManager:
         sleep(1)
         print('GO!')
         self._race_view.map_class.control_frame.hide_starting_points()
+
+        self._race_journal.start()
         for player_number in self._player_manager.players:
-            self._flight_manager.bind_telemetry(player_number, self._player_manager.trackers[player_number].track)
+            self._player_manager.trackers[player_number].lap_timer.start()
+        self._bind_race_telemetry()
+
+    def resume_race_sequence(self):
+        """
+        Resumes the race saved in the journal, e.g. after a ground station restart, without seeking the starting
+        points again. Trackers must already be linked over the same track.
+        """
+        _restored = self._race_journal.restore(self._player_manager.trackers)
+        print(f'RESUMED RACE FOR PLAYER(S) {_restored}')
+        self._race_view.map_class.control_frame.hide_starting_points()
+
+        self._race_journal.resume()
+        self._bind_race_telemetry()
+
+    def _bind_race_telemetry(self):
+        # Every racer's telemetry tick checks that racer against the fence zones
+        self._geofence_monitor = GeofenceMonitor(self._track_manager.race_model.map)
+        self._geofence_monitor.register_breach_callback(self.on_geofence_breach)
+        for player_number in self._player_manager.players:
+            self._geofence_monitor.add_racer(player_number, self._flight_manager.get_telemetry(player_number))
+
+        for player_number in self._player_manager.players:
+            _tracker = self._player_manager.trackers[player_number]
+            _tracker.register_progress_callback(self._race_journal.progress_callback(player_number))
+            self._flight_manager.bind_telemetry(player_number, _tracker.track)
+            self._flight_manager.bind_telemetry(player_number, self._geofence_monitor.racer_callback(player_number))
+            self._flight_manager.bind_telemetry(player_number, self._race_view.roster_class.update_positions)
+
+    @staticmethod
+    def on_geofence_breach(player_number: int, breached: bool):
+        if breached:
+            print(f'PLAYER {player_number} LEFT THE TRACK')
+        else:
+            print(f'PLAYER {player_number} BACK ON TRACK')
 
     def bind_race_view(self, race_view: RaceViewFrame):
         self._race_view = race_view
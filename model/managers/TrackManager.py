@@ -2,10 +2,14 @@ import typing
 from os.path import join
 
 from model.RaceModel import RaceModel
+from model.TrackCache import TrackCache
 from definitions import FENCES_DIR
 
 
 class TrackManager:
+    # Shared by every manager, so compiled tracks outlive a single race
+    _track_cache = TrackCache()
+
     def __init__(self):
         self._track_name: typing.Optional[str] = None
 
@@ -15,14 +19,24 @@ class TrackManager:
     def race_model(self):
         return self._race_model
 
-    def select_track(self, track_name: str, player_count: int):
+    @classmethod
+    def get_track_cache(cls) -> TrackCache:
+        return cls._track_cache
+
+    def select_track(self, track_name: str, player_count: int, formation: typing.Optional[str] = None):
+        """
+        :param formation: starting formation, see RaceModel.create_starting_points
+        """
         self._track_name = join(FENCES_DIR, track_name)
 
+        _compiled_track = self._track_cache.get(self._track_name)
+
         self._race_model = RaceModel()
-        self._race_model.open_map_from_file(self._track_name)
-        self._race_model.create_checkpoints()
-        self._race_model.create_track_length()
-        self._race_model.create_starting_points(player_count)
+        self._race_model.load_compiled_track(_compiled_track, player_count, formation)
+
+        # Keep newly solved starting points for the next time this track is selected
+        if _compiled_track.dirty:
+            self._track_cache.persist(_compiled_track, self._track_name)
 
     def clear_track(self):
         self._track_name = None
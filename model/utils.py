@@ -1,26 +1,221 @@
 from __future__ import annotations
 
-import time
 import typing
-from math import radians, sin, cos, asin, sqrt
+import os
+import stat
+import uuid
+from contextlib import contextmanager
+from math import radians, cos, floor
 from typing import Optional, List, Tuple
 from datetime import timedelta
-from time import time, sleep
-from threading import Thread
+from bisect import bisect_left
+from time import sleep, perf_counter
+from threading import Thread, Lock
+import struct
 
-from definitions import (EARTH_RADIUS_METERS, LOOP_CEILING, CHECKPOINT_SEPARATION_UNITS,
-                         CHECKPOINT_SEPARATION_INTERVAL_METERS, CHECKPOINT_CROSSING_THRESHOLD_METERS)
+import numpy as np
 
+from definitions import (EARTH_RADIUS_METERS, CHECKPOINT_SEPARATION_UNITS, CHECKPOINT_CROSSING_THRESHOLD_METERS,
+                         FENCE_VERTEX_QUANTIZATION_DEGREES, CHECKPOINT_GRID_CELL_METERS, TILE_METERS_PER_PIXEL,
+                         POLYGON_SIMPLIFICATION_PIXELS, OPERATING_HEIGHT_BASE_METERS, OPERATING_HEIGHT_STEP_METERS,
+                         OPERATING_HEIGHT_LAYERS, STARTING_GRID_FORMATION, STARTING_GRID_COLUMNS,
+                         STARTING_GRID_ROW_SPACING_METERS, STARTING_GRID_LATERAL_SPACING_METERS, TIMING_LAP_CAPACITY)
 
-def rotate_list(_list: list, positions: int):
+
+def rotate_list(_list: typing.Union[list, np.ndarray, CheckpointSet], positions: int):
+    if isinstance(_list, np.ndarray):
+        return np.roll(_list, positions, axis=0)
+    if isinstance(_list, CheckpointSet):
+        return _list.rotate(positions)
     return _list[-positions:] + _list[:-positions]
 
 
+def segment_intersection(start, end, a, b) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Intersects the planar segments start-end and a-b. All arguments are (..., 2) arrays that broadcast against each
+    other, so one motion segment can be tested against many gates at once.
+    :return: (intersects, fraction) arrays, where fraction is the position of the intersection along start-end
+    """
+    _motion = np.subtract(end, start)
+    _gate = np.subtract(b, a)
+    _offset = np.subtract(a, start)
+
+    _denominator = _motion[..., 0] * _gate[..., 1] - _motion[..., 1] * _gate[..., 0]
+    _parallel = _denominator == 0
+    _safe_denominator = np.where(_parallel, 1, _denominator)
+
+    _fraction = (_offset[..., 0] * _gate[..., 1] - _offset[..., 1] * _gate[..., 0]) / _safe_denominator
+    _gate_fraction = (_offset[..., 0] * _motion[..., 1] - _offset[..., 1] * _motion[..., 0]) / _safe_denominator
+
+    _intersects = ~_parallel & (0 <= _fraction) & (_fraction <= 1) & (0 <= _gate_fraction) & (_gate_fraction <= 1)
+    return _intersects, _fraction
+
+
+def point_segment_distances(point, a, b) -> np.ndarray:
+    """
+    Planar distance from a point to the segments a-b. Arguments are (..., 2) arrays that broadcast against each other.
+    """
+    _segment = np.subtract(b, a)
+    _offset = np.subtract(point, a)
+    _squared_length = np.einsum('...i,...i->...', _segment, _segment)
+    _fraction = np.einsum('...i,...i->...', _offset, _segment) / np.where(_squared_length == 0, 1, _squared_length)
+    _closest = np.add(a, np.clip(_fraction, 0, 1)[..., np.newaxis] * _segment)
+    _difference = np.subtract(point, _closest)
+    return np.hypot(_difference[..., 0], _difference[..., 1])
+
+
+def nearest_indices(points, targets, chunk_elements: int = 2 ** 20) -> np.ndarray:
+    """
+    Index of the nearest target of every point, from planar (N, 2) and (M, 2) arrays. The distance matrix is computed
+    in row chunks of at most chunk_elements entries, so memory stays bounded on large fences.
+    """
+    _points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    _targets = np.asarray(targets, dtype=np.float64).reshape(-1, 2)
+    _indices = np.empty(len(_points), dtype=int)
+
+    _chunk_rows = max(1, chunk_elements // max(1, len(_targets)))
+    for _ii_start in range(0, len(_points), _chunk_rows):
+        _chunk = _points[_ii_start:_ii_start + _chunk_rows]
+        _difference = _chunk[:, np.newaxis, :] - _targets[np.newaxis, :, :]
+        _squared_distances = np.einsum('ijk,ijk->ij', _difference, _difference)
+        _indices[_ii_start:_ii_start + _chunk_rows] = np.argmin(_squared_distances, axis=1)
+    return _indices
+
+
+def closest_points_on_polygon(points, vertices, chunk_elements: int = 2 ** 18) -> np.ndarray:
+    """
+    Closest point of a closed planar polygon boundary to every point, computed against all edges in bounded chunks.
+    :param points: (N, 2) array
+    :param vertices: (M, 2) array of polygon vertices, the last one connecting back to the first
+    :return: (N, 2) array
+    """
+    _points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    _starts = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+    _edges = np.roll(_starts, -1, axis=0) - _starts
+    _squared_lengths = np.einsum('ij,ij->i', _edges, _edges)
+    _squared_lengths = np.where(_squared_lengths == 0, 1, _squared_lengths)
+    _closest = np.empty_like(_points)
+
+    _chunk_rows = max(1, chunk_elements // max(1, len(_starts)))
+    for _ii_start in range(0, len(_points), _chunk_rows):
+        _chunk = _points[_ii_start:_ii_start + _chunk_rows]
+        _offsets = _chunk[:, np.newaxis, :] - _starts[np.newaxis, :, :]
+        _fractions = np.clip(np.einsum('ijk,jk->ij', _offsets, _edges) / _squared_lengths, 0, 1)
+        _candidates = _starts + _fractions[..., np.newaxis] * _edges
+        _difference = _chunk[:, np.newaxis, :] - _candidates
+        _nearest_edges = np.argmin(np.einsum('ijk,ijk->ij', _difference, _difference), axis=1)
+        _closest[_ii_start:_ii_start + _chunk_rows] = _candidates[np.arange(len(_chunk)), _nearest_edges]
+    return _closest
+
+
+def sample_closed_polyline(vertices, distances) -> np.ndarray:
+    """
+    Points at the given arc length distances along a closed planar polyline, starting at its first vertex.
+    :param vertices: (M, 2) array, the last vertex connecting back to the first
+    :param distances: distances in meters, wrapped around the polyline's length
+    :return: (len(distances), 2) array
+    """
+    _starts = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+    _edges = np.roll(_starts, -1, axis=0) - _starts
+    _edge_lengths = np.hypot(_edges[:, 0], _edges[:, 1])
+    _cumulative = np.concatenate(([0.0], np.cumsum(_edge_lengths)))
+
+    _distances = np.mod(distances, _cumulative[-1])
+    _indices = np.clip(np.searchsorted(_cumulative, _distances, side='right') - 1, 0, len(_starts) - 1)
+    _fractions = (_distances - _cumulative[_indices]) / np.where(_edge_lengths[_indices] == 0, 1,
+                                                                 _edge_lengths[_indices])
+    return _starts[_indices] + _fractions[:, np.newaxis] * _edges[_indices]
+
+
+def polyline_length(vertices, closed: bool = True) -> float:
+    _vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+    _ends = np.roll(_vertices, -1, axis=0) if closed else _vertices[1:]
+    _edges = _ends - _vertices[:len(_ends)]
+    return float(np.hypot(_edges[:, 0], _edges[:, 1]).sum())
+
+
+def simplification_significance(vertices) -> np.ndarray:
+    """
+    Douglas-Peucker significance of every vertex of a closed planar polygon: the largest tolerance at which the
+    vertex survives simplification. Keeping the vertices whose significance is above a tolerance gives the same
+    polygon as running Douglas-Peucker at that tolerance, so one pass serves every tolerance.
+    The first vertex, the one farthest from it and the most significant of the rest are never dropped (inf), so the
+    simplified polygon always keeps at least a triangle.
+    """
+    _vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+    _count = len(_vertices)
+    _significance = np.full(_count, np.inf)
+    if _count <= 3:
+        return _significance
+
+    # The ring is split at its first vertex and the vertex farthest from it into two open chains
+    _far = int(np.argmax(np.hypot(*(_vertices - _vertices[0]).T)))
+    _ring = np.vstack((_vertices, _vertices[:1]))
+    _stack = [(0, _far, np.inf), (_far, _count, np.inf)]
+    while _stack:
+        _start, _end, _parent = _stack.pop()
+        if _end - _start < 2:
+            continue
+        _distances = point_segment_distances(_ring[_start + 1:_end], _ring[_start], _ring[_end])
+        _split = _start + 1 + int(np.argmax(_distances))
+        # A vertex never outlives the split that exposed it
+        _value = min(float(_distances[_split - _start - 1]), _parent)
+        _significance[_split] = _value
+        _stack.append((_start, _split, _value))
+        _stack.append((_split, _end, _value))
+
+    _finite = np.flatnonzero(np.isfinite(_significance))
+    if len(_finite):
+        _significance[_finite[np.argmax(_significance[_finite])]] = np.inf
+    return _significance
+
+
+def meters_per_pixel(lat: float, zoom: float) -> float:
+    """
+    Ground size of a screen pixel of a web mercator tile map at a latitude and zoom level.
+    """
+    return TILE_METERS_PER_PIXEL * cos(radians(lat)) / 2 ** zoom
+
+
+def operating_heights(player_count: int, base: float = OPERATING_HEIGHT_BASE_METERS,
+                      step: float = OPERATING_HEIGHT_STEP_METERS, layers: int = OPERATING_HEIGHT_LAYERS) -> np.ndarray:
+    """
+    Flight altitude of every racer. Racers cycle through the altitude layers in order, so consecutive racers (side by
+    side or one behind the other on the grid) never share a layer, whatever the field size.
+    """
+    return base + step * (np.arange(player_count) % max(1, min(layers, player_count)))
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = 'w', encoding: Optional[str] = None) -> typing.Iterator[typing.IO]:
+    """
+    Opens a temporary file next to path, which replaces path once the block completes. It is flushed to disk before
+    the rename, so a crash leaves either the old or the new file, never half of it. The file gets the permissions of
+    the file it replaces, or the ones a plain open would give a new file.
+    :param mode: 'w' or 'wb'
+    """
+    _directory, _name = os.path.split(os.path.abspath(path))
+    _temporary_path = os.path.join(_directory, f'.{_name}.{uuid.uuid4().hex[:8]}.tmp')
+    # Created like open() creates files, with the umask applied
+    _fd = os.open(_temporary_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o666)
+    try:
+        with os.fdopen(_fd, mode, encoding=encoding) as _file:
+            yield _file
+            _file.flush()
+            os.fsync(_file.fileno())
+        if os.path.exists(path):
+            os.chmod(_temporary_path, stat.S_IMODE(os.stat(path).st_mode))
+        os.replace(_temporary_path, path)
+    except BaseException:
+        os.remove(_temporary_path)
+        raise
+
+
 def timeit(func):
     def wrapper(*args, **kwargs):
-        _start_time = time.perf_counter()
+        _start_time = perf_counter()
         _r = func(*args, **kwargs)
-        _end_time = time.perf_counter()
+        _end_time = perf_counter()
         _total_time = _end_time - _start_time
         print(f'Function {func.__name__}{args} {kwargs} Took {_total_time:.4f} seconds')
         return _r
@@ -34,7 +229,16 @@ class Telemetry(dict):
     def __init__(self):
         dict.__init__(self, zip(self._telemetry_keys, [None]*len(self._telemetry_keys)))
 
-    def set_telemetry(self, lat, lon, heading, groundSpeed, altitude, battery, state):
+        # Local perf_counter time the last sample was received at. Not a dict key, so it never goes on the wire.
+        self._timestamp: Optional[float] = None
+
+    @property
+    def timestamp(self):
+        return self._timestamp
+
+    def set_telemetry(self, lat, lon, heading, groundSpeed, altitude, battery, state,
+                      timestamp: Optional[float] = None):
+        self._timestamp = perf_counter() if timestamp is None else timestamp
         self.__setitem__('lat', lat)
         self.__setitem__('lon', lon)
         self.__setitem__('heading', heading)
@@ -66,7 +270,7 @@ class Stopwatch:
     @property
     def current_time_seconds(self):
         if self._running:
-            _running_time = time() - self._start_time
+            _running_time = perf_counter() - self._start_time
             return _running_time
 
     @property
@@ -77,7 +281,7 @@ class Stopwatch:
         if not self._running:
             self._laps = []
             self._toggle()
-            self._start_time = time()
+            self._start_time = perf_counter()
 
     def lap(self):
         if self._running:
@@ -94,87 +298,753 @@ class Stopwatch:
         self._running = not self._running
 
 
+class LapTimer:
+    """
+    Lap and sector timing of a racer on the monotonic perf_counter clock, fed by checkpoint crossings.
+    Sector s of a lap ends at the racer's checkpoint s, and the lap ends at its last checkpoint. Times are stored in
+    preallocated (laps, sectors) arrays that double when full. Bests and last values are kept up to date on every
+    crossing, so every query is O(1). Sectors that were not timed (skipped checkpoints) are NaN.
+    The first lap runs from the standing start to the racer's last checkpoint. It is the out-lap, kept apart from the
+    timed laps and left out of bests and deltas.
+    """
+    def __init__(self, sector_count: int, capacity: int = TIMING_LAP_CAPACITY,
+                 clock: typing.Callable[[], float] = perf_counter):
+        self._sector_count = sector_count
+        self._clock = clock
+
+        # Row i holds lap i, the row after the last completed lap is the lap in progress
+        self._sector_times = np.full((max(1, capacity), sector_count), np.nan)
+        self._lap_times = np.full(max(1, capacity), np.nan)
+        self._lap_count = 0
+
+        # Out-lap, from the start to the first crossing of the racer's last checkpoint
+        self._on_out_lap = False
+        self._out_lap_time = np.nan
+        self._out_lap_sector_times = np.full(sector_count, np.nan)
+
+        self._start_time: Optional[float] = None
+        self._lap_start_time: Optional[float] = None
+        self._split_time: Optional[float] = None
+        self._next_sector = 0
+
+        self._best_lap_time = np.inf
+        self._best_lap = -1
+        self._best_sector_times = np.full(sector_count, np.inf)
+
+    @property
+    def running(self):
+        return self._start_time is not None
+
+    @property
+    def lap_count(self):
+        """
+        Completed timed laps, the out-lap is not one of them.
+        """
+        return self._lap_count
+
+    @property
+    def on_out_lap(self):
+        return self._on_out_lap
+
+    @property
+    def out_lap_time(self) -> Optional[float]:
+        """
+        Out-lap time, None until it is completed or if it was not counted.
+        """
+        return None if np.isnan(self._out_lap_time) else float(self._out_lap_time)
+
+    @property
+    def out_lap_sector_times(self) -> np.ndarray:
+        """
+        Read-only view of the out-lap's sector times.
+        """
+        _view = self._out_lap_sector_times.view()
+        _view.flags.writeable = False
+        return _view
+
+    @property
+    def lap_times(self) -> np.ndarray:
+        """
+        Read-only view of the completed lap times.
+        """
+        _view = self._lap_times[:self._lap_count]
+        _view.flags.writeable = False
+        return _view
+
+    @property
+    def sector_times(self) -> np.ndarray:
+        """
+        Read-only (completed laps + 1, sectors) view of the sector times of the timed laps, the last row is the lap
+        in progress.
+        """
+        _view = self._sector_times[:self._lap_count + 1]
+        _view.flags.writeable = False
+        return _view
+
+    @property
+    def last_lap_time(self) -> Optional[float]:
+        return float(self._lap_times[self._lap_count - 1]) if self._lap_count else None
+
+    @property
+    def best_lap_time(self) -> Optional[float]:
+        return float(self._best_lap_time) if self._best_lap >= 0 else None
+
+    @property
+    def best_lap(self) -> Optional[int]:
+        return self._best_lap if self._best_lap >= 0 else None
+
+    @property
+    def last_lap_delta(self) -> Optional[float]:
+        """
+        Last lap time minus the best lap time, 0 when the last lap is the best one.
+        """
+        if not self._lap_count:
+            return None
+        return float(self._lap_times[self._lap_count - 1] - self._best_lap_time)
+
+    @property
+    def best_sector_times(self) -> np.ndarray:
+        """
+        Best time of every sector, inf for sectors never timed.
+        """
+        _view = self._best_sector_times.view()
+        _view.flags.writeable = False
+        return _view
+
+    def now(self) -> float:
+        return self._clock()
+
+    def elapsed(self, timestamp: Optional[float] = None) -> Optional[float]:
+        if self._start_time is None:
+            return None
+        return (self._clock() if timestamp is None else timestamp) - self._start_time
+
+    def current_lap_time(self, timestamp: Optional[float] = None) -> Optional[float]:
+        if self._lap_start_time is None:
+            return None
+        return (self._clock() if timestamp is None else timestamp) - self._lap_start_time
+
+    def sector_time(self, lap: int, sector: int) -> float:
+        return float(self._sector_times[lap, sector])
+
+    def sector_delta(self, lap: int, sector: int) -> float:
+        """
+        Sector time minus the best time of that sector (NaN if either is missing).
+        """
+        _best = self._best_sector_times[sector]
+        return float(self._sector_times[lap, sector] - _best) if np.isfinite(_best) else np.nan
+
+    def start(self, timestamp: Optional[float] = None):
+        _timestamp = self._clock() if timestamp is None else timestamp
+        self._start_time = _timestamp
+        self._lap_start_time = _timestamp
+        self._split_time = _timestamp
+        self._next_sector = 0
+        self._on_out_lap = True
+        self._out_lap_time = np.nan
+        self._out_lap_sector_times[:] = np.nan
+
+    def split(self, sector: int, timestamp: Optional[float] = None):
+        """
+        Records the crossing of the checkpoint ending a sector. A sector is only timed if the previous checkpoint
+        crossed was the one right before it.
+        """
+        if self._start_time is None:
+            return
+        _timestamp = self._clock() if timestamp is None else timestamp
+
+        if sector == self._next_sector:
+            _sector_time = _timestamp - self._split_time
+            if self._on_out_lap:
+                self._out_lap_sector_times[sector] = _sector_time
+            else:
+                self._sector_times[self._lap_count, sector] = _sector_time
+            if not self._on_out_lap and _sector_time < self._best_sector_times[sector]:
+                self._best_sector_times[sector] = _sector_time
+        self._split_time = _timestamp
+        self._next_sector = sector + 1
+
+    def lap(self, timestamp: Optional[float] = None, counted: bool = True):
+        """
+        Closes the lap in progress, the first one after start is the out-lap. A lap that is not counted (skipped
+        checkpoints) is discarded.
+        """
+        if self._start_time is None:
+            return
+        _timestamp = self._clock() if timestamp is None else timestamp
+
+        if self._on_out_lap:
+            self._on_out_lap = False
+            if counted:
+                self._out_lap_time = _timestamp - self._lap_start_time
+            else:
+                self._out_lap_sector_times[:] = np.nan
+        elif counted:
+            _lap_time = _timestamp - self._lap_start_time
+            self._lap_times[self._lap_count] = _lap_time
+            if _lap_time < self._best_lap_time:
+                self._best_lap_time = _lap_time
+                self._best_lap = self._lap_count
+            self._lap_count += 1
+            if self._lap_count + 1 > len(self._lap_times):
+                self._grow()
+        else:
+            self._sector_times[self._lap_count] = np.nan
+
+        self._lap_start_time = _timestamp
+        self._split_time = _timestamp
+        self._next_sector = 0
+
+    # sector count, lap count, best lap, next sector, on out-lap, start, lap start and split times, best lap time,
+    # out-lap time
+    _STATE_HEADER = struct.Struct('<IIiI?ddddd')
+
+    def pack_state(self) -> bytes:
+        """
+        Binary snapshot of the timer: a fixed header followed by the best sector times, the out-lap sector times, the
+        completed lap times and the sector times up to the lap in progress, as float64. Missing times are NaN.
+        """
+        _header = self._STATE_HEADER.pack(
+            self._sector_count, self._lap_count, self._best_lap, self._next_sector, self._on_out_lap,
+            *(np.nan if _time is None else _time for _time in (self._start_time, self._lap_start_time,
+                                                               self._split_time)),
+            self._best_lap_time, self._out_lap_time)
+        return b''.join((_header, self._best_sector_times.tobytes(), self._out_lap_sector_times.tobytes(),
+                         self._lap_times[:self._lap_count].tobytes(),
+                         self._sector_times[:self._lap_count + 1].tobytes()))
+
+    def unpack_state(self, data: bytes, offset: int = 0, time_shift: float = 0.0) -> int:
+        """
+        Restores a pack_state snapshot.
+        :param time_shift: added to the snapshot's clock readings, to move them to this process' clock
+        :return: offset right after the snapshot
+        """
+        _sector_count, _lap_count, _best_lap, _next_sector, _on_out_lap, _start_time, _lap_start_time, _split_time, \
+            _best_lap_time, _out_lap_time = self._STATE_HEADER.unpack_from(data, offset)
+        if _sector_count != self._sector_count:
+            raise ValueError(f'Snapshot has {_sector_count} sectors, timer has {self._sector_count}')
+        offset += self._STATE_HEADER.size
+
+        _best_sector_times = np.frombuffer(data, np.float64, _sector_count, offset)
+        offset += _best_sector_times.nbytes
+        _out_lap_sector_times = np.frombuffer(data, np.float64, _sector_count, offset)
+        offset += _out_lap_sector_times.nbytes
+        _lap_times = np.frombuffer(data, np.float64, _lap_count, offset)
+        offset += _lap_times.nbytes
+        _sector_times = np.frombuffer(data, np.float64, (_lap_count + 1) * _sector_count, offset)
+        offset += _sector_times.nbytes
+
+        while _lap_count + 1 > len(self._lap_times):
+            self._grow()
+        self._lap_times[:] = np.nan
+        self._lap_times[:_lap_count] = _lap_times
+        self._sector_times[:] = np.nan
+        self._sector_times[:_lap_count + 1] = _sector_times.reshape(-1, _sector_count)
+        self._best_sector_times = _best_sector_times.copy()
+        self._out_lap_sector_times = _out_lap_sector_times.copy()
+        self._on_out_lap = _on_out_lap
+        self._out_lap_time = _out_lap_time
+
+        self._lap_count = _lap_count
+        self._best_lap = _best_lap
+        self._best_lap_time = _best_lap_time
+        self._next_sector = _next_sector
+        self._start_time, self._lap_start_time, self._split_time = (
+            None if np.isnan(_time) else _time + time_shift for _time in (_start_time, _lap_start_time, _split_time))
+        return offset
+
+    def _grow(self):
+        _capacity = 2 * len(self._lap_times)
+        self._lap_times = np.concatenate((self._lap_times, np.full(_capacity - len(self._lap_times), np.nan)))
+        self._sector_times = np.concatenate(
+            (self._sector_times, np.full((_capacity - len(self._sector_times), self._sector_count), np.nan)))
+
+
 class Tracker:
-    def __init__(self, telemetry_info: Telemetry, checkpoints: List[Checkpoint], zone_lengths: List[float]):
+    def __init__(self, telemetry_info: Telemetry, checkpoints: List[Checkpoint], zone_lengths: List[float],
+                 projection: Optional[TrackProjection] = None, lap_timer: Optional[LapTimer] = None,
+                 checkpoint_grid: Optional[CheckpointGrid] = None):
+        """
+        Tracks a racer around the circuit from its telemetry.
+        :param checkpoints: checkpoints in racing order, starting with the one behind the racer's starting point
+        :param zone_lengths: length of every zone, where zone k goes from checkpoints[k] to checkpoints[k + 1]
+        (see TrackLength.zone_lengths)
+        :param lap_timer: timing engine fed with every crossing, one sector per checkpoint by default
+        :param checkpoint_grid: spatial index of the track's checkpoints in the same projection, in any rotation, to
+        share one index among all racers (see RaceModel.checkpoint_grid). Built for this tracker if missing or if it
+        indexes other checkpoints.
+        """
+        if len(zone_lengths) != len(checkpoints):
+            raise ValueError(f'Expected {len(checkpoints)} zone lengths, got {len(zone_lengths)}')
         self._telemetry_info = telemetry_info
 
-        checkpoint_list = rotate_list([TrackableCheckpoint(*checkpoint.endpoints) for checkpoint in checkpoints], -1)
+        checkpoint_set = rotate_list(CheckpointSet.of(checkpoints), -1)
+        checkpoint_list = [TrackableCheckpoint(*checkpoint.endpoints) for checkpoint in checkpoint_set]
         self._checkpoints: List[TrackableCheckpoint] = checkpoint_list
-        self._lengths: List[float]
-        self._zone_lengths = rotate_list(zone_lengths, 1)
+
+        # All tracking math is done in the track's east/north plane (meters)
+        if projection is None:
+            projection = TrackProjection(checkpoint_list[0].midpoint)
+        self._projection: TrackProjection = projection
+        self._midpoints = projection.project_coordinates(checkpoint_set.midpoints)
+        self._endpoints = projection.project_checkpoints(checkpoint_set)
+        self._checkpoint_grid, self._grid_offset = self._share_grid(checkpoint_grid)
+        self._previous_position: Optional[np.ndarray] = None
+        self._previous_timestamp: Optional[float] = None
+        # Last checkpoint crossed, not tested again until another one is, so jitter or an overshoot back and forth
+        # across its line (or the line of a checkpoint reached by proximity) does not cross it twice
+        self._last_crossing: Optional[int] = None
+
+        # Normal of every gate, oriented in the racing direction: along the midpoints polyline through it
+        _gates = self._endpoints[:, 1] - self._endpoints[:, 0]
+        _normals = np.stack((-_gates[:, 1], _gates[:, 0]), axis=1)
+        _tangents = np.roll(self._midpoints, -1, axis=0) - np.roll(self._midpoints, 1, axis=0)
+        self._gate_normals = np.where(np.einsum('ij,ij->i', _normals, _tangents)[:, np.newaxis] < 0,
+                                      -_normals, _normals)
+
+        # Zone k of the tracker runs from its checkpoint k - 1 to its checkpoint k, along the midpoints polyline
+        self._zone_lengths = np.asarray(zone_lengths, dtype=np.float64)
+        self._zone_starts = np.concatenate(([0.0], np.cumsum(self._zone_lengths)[:-1]))
+        self._lap_length = float(self._zone_lengths.sum())
+        self._segment_starts = np.roll(self._midpoints, 1, axis=0)
+        self._segment_vectors = self._midpoints - self._segment_starts
+        _squared_lengths = np.einsum('ij,ij->i', self._segment_vectors, self._segment_vectors)
+        self._segment_squared_lengths = np.where(_squared_lengths == 0, 1, _squared_lengths)
 
         self._lap: int = 0
         self._zone: int = 0
 
+        # Per tick cache of the racer's position along the track
+        self._zone_fraction: float = 0.0
+        self._progress: float = 0.0
+
+        self._progress_callbacks: List[typing.Callable[[Tracker], None]] = []
+
+        self._lap_timer: LapTimer = lap_timer if lap_timer is not None else LapTimer(len(checkpoint_list))
+
+    def _share_grid(self, checkpoint_grid: Optional[CheckpointGrid]) -> Tuple[CheckpointGrid, int]:
+        """
+        :return: the grid to use and the grid index of the tracker's checkpoint 0
+        """
+        if checkpoint_grid is not None and checkpoint_grid.endpoints.shape == self._endpoints.shape:
+            _grid_endpoints = checkpoint_grid.endpoints
+            _starts = np.flatnonzero(np.all(np.isclose(_grid_endpoints, self._endpoints[0], rtol=0, atol=1e-6),
+                                            axis=(1, 2)))
+            for _offset in _starts.tolist():
+                if np.allclose(np.roll(_grid_endpoints, -_offset, axis=0), self._endpoints, rtol=0, atol=1e-6):
+                    return checkpoint_grid, _offset
+        return CheckpointGrid(self._endpoints), 0
+
+    def _from_grid(self, indices: np.ndarray) -> np.ndarray:
+        return (indices - self._grid_offset) % len(self._checkpoints)
+
+    @property
+    def projection(self):
+        return self._projection
+
+    @property
+    def lap_timer(self):
+        return self._lap_timer
+
+    @property
+    def checkpoint_grid(self):
+        return self._checkpoint_grid
+
+    @property
+    def lap(self):
+        return self._lap
+
+    @property
+    def zone(self):
+        return self._zone
+
+    @property
+    def lap_length(self):
+        return self._lap_length
+
+    @property
+    def progress(self):
+        """
+        Meters travelled along the track since the checkpoint behind the starting point, counting completed laps.
+        Updated on every track() call.
+        """
+        return self._progress
+
+    @property
+    def lap_progress(self):
+        return self._progress - self._lap * self._lap_length
+
+    @property
+    def ranking_key(self) -> Tuple[int, int, float]:
+        """
+        Sortable key of the racer's race position, greater is ahead.
+        """
+        return self._lap, self._zone, self._progress
+
+    def register_progress_callback(self, func: typing.Callable[[Tracker], None]):
+        self._progress_callbacks.append(func)
+
     def track(self):
-        drone_position = Vertex(self._telemetry_info['lat'], self._telemetry_info['lon'])
-        next_checkpoint = self._checkpoints[self._zone].midpoint
-        distance_to_next_checkpoint = TrackLength.distance(drone_position, next_checkpoint)
-        if distance_to_next_checkpoint < CHECKPOINT_CROSSING_THRESHOLD_METERS:
-            self.cross_checkpoint()
-
-    def cross_checkpoint(self):
-        for index, checkpoint in enumerate(self._checkpoints):
-            if not checkpoint.crossed:
-                checkpoint.cross()
-                print(f'CROSSED CHECKPOINT {index}')
-                if index + 1 < len(self._checkpoints):
-                    self._zone = index + 1
-                else:
-                    self._zone = 0
-                    self._lap += 1
-                    print(f'COMPLETED {self._lap} LAP(S)!')
-                return
+        drone_position = self._projection.project_telemetry(self._telemetry_info)
+        timestamp = self._telemetry_info.timestamp
+        if timestamp is None:
+            timestamp = self._lap_timer.now()
+        previous_position, previous_timestamp = self._previous_position, self._previous_timestamp
+        self._previous_position, self._previous_timestamp = drone_position, timestamp
+
+        # A gate counts as crossed if the motion since the last sample goes through it, whatever the sample rate.
+        # Every uncrossed gate near the motion is tested, so the tracker re-acquires the right zone after a skip.
+        # Only crossings in the racing direction count. The crossing time is interpolated between both samples from
+        # where the motion meets the gate.
+        crossed_any = False
+        if previous_position is not None:
+            candidates = self._from_grid(self._checkpoint_grid.segment_candidates(previous_position, drone_position))
+            candidates = candidates[[index != self._last_crossing and not self._checkpoints[index].crossed
+                                     for index in candidates.tolist()]]
+            crossed, fractions = segment_intersection(previous_position, drone_position,
+                                                      self._endpoints[candidates, 0], self._endpoints[candidates, 1])
+            crossed &= self._gate_normals[candidates] @ (drone_position - previous_position) > 0
+            crossed_any = bool(np.any(crossed))
+            order = np.argsort(fractions[crossed])
+            for index, fraction in zip(candidates[crossed][order].tolist(), fractions[crossed][order].tolist()):
+                self.cross_checkpoint(index, previous_timestamp + fraction * (timestamp - previous_timestamp))
+
+        if not crossed_any:
+            distance_to_next_checkpoint = TrackProjection.planar_distances(drone_position,
+                                                                           self._midpoints[self._zone])
+            if distance_to_next_checkpoint < CHECKPOINT_CROSSING_THRESHOLD_METERS:
+                # Gate reached by proximity, usually just before the line: the crossing time is when the current
+                # motion meets the gate's line, extrapolated at most as far as the proximity threshold
+                if previous_position is not None:
+                    motion = drone_position - previous_position
+                    gate_start, gate_end = self._endpoints[self._zone]
+                    gate = gate_end - gate_start
+                    denominator = float(motion[0] * gate[1] - motion[1] * gate[0])
+                    if denominator:
+                        offset = gate_start - previous_position
+                        fraction = float(offset[0] * gate[1] - offset[1] * gate[0]) / denominator
+                        max_fraction = 1 + CHECKPOINT_CROSSING_THRESHOLD_METERS / float(np.hypot(*motion))
+                        timestamp = previous_timestamp + min(max(fraction, 0.0), max_fraction) * \
+                            (timestamp - previous_timestamp)
+                # The zone's own checkpoint, even if an earlier one was skipped
+                self.cross_checkpoint(self._zone, timestamp)
+
+        self._update_progress(drone_position)
+
+    def _update_progress(self, drone_position: np.ndarray):
+        # Project the drone onto its zone's stretch of the midpoints polyline
+        _offset = drone_position - self._segment_starts[self._zone]
+        _fraction = np.dot(_offset, self._segment_vectors[self._zone]) / self._segment_squared_lengths[self._zone]
+        self._zone_fraction = min(max(float(_fraction), 0.0), 1.0)
+
+        _lap_progress = self._zone_starts[self._zone] + self._zone_fraction * self._zone_lengths[self._zone]
+        self._progress = self._lap * self._lap_length + float(_lap_progress)
+
+        for _func in self._progress_callbacks:
+            _func(self)
+
+    def nearest_checkpoints(self, count: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Checkpoints nearest to the drone's current position, from the tracker's spatial index.
+        :return: (indices, distances in meters), closest first
+        """
+        drone_position = self._projection.project_telemetry(self._telemetry_info)
+        _indices, _distances = self._checkpoint_grid.nearest(drone_position, count)
+        return self._from_grid(_indices), _distances
+
+    def cross_checkpoint(self, index: Optional[int] = None, timestamp: Optional[float] = None):
+        """
+        Marks a checkpoint as crossed and moves the tracker to the zone after it.
+        :param index: checkpoint crossed, by default the first one not crossed in this lap. Crossing any other
+        checkpoint re-acquires the zone after it, and the skipped checkpoints stay uncrossed for this lap.
+        :param timestamp: perf_counter time of the crossing, now by default
+        """
+        if index is None:
+            index = next((index for index, checkpoint in enumerate(self._checkpoints) if not checkpoint.crossed), 0)
+        elif index != self._zone:
+            print(f'RE-ACQUIRED AT CHECKPOINT {index}, EXPECTED CHECKPOINT {self._zone}')
+
+        if timestamp is None:
+            timestamp = self._lap_timer.now()
+        self._checkpoints[index].cross()
+        self._last_crossing = index
+        self._lap_timer.split(index, timestamp)
+        print(f'CROSSED CHECKPOINT {index}')
+        if index + 1 < len(self._checkpoints):
+            self._zone = index + 1
+            return
+
+        self._zone = 0
+        if all(checkpoint.crossed for checkpoint in self._checkpoints):
+            self._lap += 1
+            self._lap_timer.lap(timestamp)
+            print(f'COMPLETED {self._lap} LAP(S)!')
+        else:
+            self._lap_timer.lap(timestamp, counted=False)
+            print('LAP NOT COUNTED, SKIPPED CHECKPOINT(S)')
 
         for checkpoint in self._checkpoints:
             checkpoint.clear()
-        self._checkpoints[0].cross()
-        self._zone = 1
-        print(f'CROSSED CHECKPOINT 0')
 
-    def calculate_distance_difference(self, other_tracker: Tracker):
-        my_distances = self.calculate_distances_to_boundaries()
-        other_distances = other_tracker.calculate_distances_to_boundaries()
+    # lap, zone, checkpoint count, progress, zone fraction, previous east, north and timestamp, last checkpoint crossed
+    # (-1 if none)
+    _STATE_HEADER = struct.Struct('<iiIdddddi')
 
-        my_distance_to_lap = my_distances[1] + self.zone_distances_to_lap()
-        other_distance_to_lap = other_distances[1] + other_tracker.zone_distances_to_lap()
+    def pack_state(self) -> bytes:
+        """
+        Binary snapshot of the tracking state: lap, zone, progress, last sample, checkpoint crossed flags (one bit
+        each) and the lap timer.
+        """
+        _previous_east, _previous_north = (np.nan, np.nan) if self._previous_position is None else \
+            self._previous_position.tolist()
+        _header = self._STATE_HEADER.pack(
+            self._lap, self._zone, len(self._checkpoints), self._progress, self._zone_fraction,
+            _previous_east, _previous_north,
+            np.nan if self._previous_timestamp is None else self._previous_timestamp,
+            -1 if self._last_crossing is None else self._last_crossing)
+        _crossed = np.packbits([checkpoint.crossed for checkpoint in self._checkpoints])
+        return b''.join((_header, _crossed.tobytes(), self._lap_timer.pack_state()))
+
+    def unpack_state(self, data: bytes, offset: int = 0, time_shift: float = 0.0) -> int:
+        """
+        Restores a pack_state snapshot taken from a tracker over the same checkpoints, and notifies the progress
+        callbacks so rankings are up to date before the next tick.
+        :param time_shift: added to the snapshot's clock readings, to move them to this process' clock
+        :return: offset right after the snapshot
+        """
+        _lap, _zone, _checkpoint_count, _progress, _zone_fraction, _previous_east, _previous_north, \
+            _previous_timestamp, _last_crossing = self._STATE_HEADER.unpack_from(data, offset)
+        if _checkpoint_count != len(self._checkpoints):
+            raise ValueError(f'Snapshot has {_checkpoint_count} checkpoints, tracker has {len(self._checkpoints)}')
+        offset += self._STATE_HEADER.size
+
+        _flag_bytes = (_checkpoint_count + 7) // 8
+        _crossed = np.unpackbits(np.frombuffer(data, np.uint8, _flag_bytes, offset), count=_checkpoint_count)
+        offset += _flag_bytes
+        offset = self._lap_timer.unpack_state(data, offset, time_shift)
+
+        self._lap, self._zone = _lap, _zone
+        self._progress, self._zone_fraction = _progress, _zone_fraction
+        self._previous_position = None if np.isnan(_previous_east) else np.array([_previous_east, _previous_north])
+        self._previous_timestamp = None if np.isnan(_previous_timestamp) else _previous_timestamp + time_shift
+        self._last_crossing = None if _last_crossing < 0 else _last_crossing
+        for checkpoint, crossed in zip(self._checkpoints, _crossed.tolist()):
+            if crossed:
+                checkpoint.cross()
+            else:
+                checkpoint.clear()
 
-        return my_distance_to_lap - other_distance_to_lap
+        for _func in self._progress_callbacks:
+            _func(self)
+        return offset
+
+    def calculate_distance_difference(self, other_tracker: Tracker):
+        """
+        Meters along the track this racer is ahead of the other one (negative when behind).
+        """
+        return self._progress - other_tracker._progress
 
     def zone_distances_to_lap(self):
-        return sum(self._zone_lengths[self._zone+1::])
+        return self._lap_length - self._zone_starts[self._zone] - self._zone_lengths[self._zone]
 
     def calculate_distances_to_boundaries(self):
-        drone_position = Vertex(self._telemetry_info['lat'], self._telemetry_info['lon'])
-        next_checkpoint = self._checkpoints[self._zone].midpoint
-        previous_checkpoint = self._checkpoints[self._zone - 1].midpoint
+        _distance_to_previous, _distance_to_next = self.batch_distances_to_boundaries([self])[0].tolist()
+        return _distance_to_previous, _distance_to_next
 
-        distance_to_next = TrackLength.distance(drone_position, next_checkpoint)
-        distance_to_previous = TrackLength.distance(previous_checkpoint, drone_position)
-        return distance_to_previous, distance_to_next
+    @staticmethod
+    def batch_distances_to_boundaries(trackers: List[Tracker]) -> np.ndarray:
+        """
+        Along-track distances from each tracker's drone to its previous and next checkpoints, read from the progress
+        cached on the last tick.
+        :return: (len(trackers), 2) array of (distance_to_previous, distance_to_next) rows
+        """
+        _fractions = np.array([_tracker._zone_fraction for _tracker in trackers], dtype=np.float64)
+        _lengths = np.array([_tracker._zone_lengths[_tracker._zone] for _tracker in trackers], dtype=np.float64)
+        return np.column_stack((_fractions * _lengths, (1 - _fractions) * _lengths))
 
     def is_ahead_of(self, other_tracker: Tracker):
-        laps = self._lap - other_tracker._lap
+        return self.ranking_key > other_tracker.ranking_key
 
-        if laps > 0:
-            return True
-        elif laps < 0:
-            return False
-        else:
-            zones = self._zone - other_tracker._zone
-            if zones > 0:
-                return True
-            elif zones < 0:
-                return False
+
+class Leaderboard:
+    """
+    Racers sorted by ranking key, leader first. Each update moves a single entry with binary searches and only
+    refreshes the positions of the entries it jumps over, so reading a position is a dictionary lookup.
+    Racers are updated from their own telemetry threads, every access holds the board's lock.
+    """
+    def __init__(self):
+        # (negated ranking key, racer id), ascending, so the racer ahead comes first
+        self._entries: List[Tuple[Tuple, int]] = []
+        self._keys: typing.Dict[int, Tuple] = {}
+        self._positions: typing.Dict[int, int] = {}
+        self._lock = Lock()
+
+    @property
+    def ranking(self) -> List[int]:
+        with self._lock:
+            return [_racer_id for _, _racer_id in self._entries]
+
+    def position(self, racer_id: int) -> Optional[int]:
+        """
+        1-based race position, None for an unknown racer.
+        """
+        with self._lock:
+            return self._positions.get(racer_id)
+
+    def update(self, racer_id: int, ranking_key: typing.Sequence):
+        _key = tuple(-_value for _value in ranking_key)
+        with self._lock:
+            _old_key = self._keys.get(racer_id)
+            if _old_key == _key:
+                return
+
+            if _old_key is not None:
+                _old_index = bisect_left(self._entries, (_old_key, racer_id))
+                del self._entries[_old_index]
             else:
-                distance = self.calculate_distance_difference(other_tracker)
-                if distance > 0:
-                    return True
-                else:
-                    return False
+                _old_index = len(self._entries)
+            _new_index = bisect_left(self._entries, (_key, racer_id))
+            self._entries.insert(_new_index, (_key, racer_id))
+            self._keys[racer_id] = _key
+
+            for _ii_index in range(min(_old_index, _new_index), max(_old_index, _new_index) + 1):
+                self._positions[self._entries[_ii_index][1]] = _ii_index + 1
+
+    def remove(self, racer_id: int):
+        with self._lock:
+            _old_key = self._keys.pop(racer_id, None)
+            if _old_key is None:
+                return
+            _old_index = bisect_left(self._entries, (_old_key, racer_id))
+            del self._entries[_old_index]
+            del self._positions[racer_id]
+            for _ii_index in range(_old_index, len(self._entries)):
+                self._positions[self._entries[_ii_index][1]] = _ii_index + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries = []
+            self._keys = {}
+            self._positions = {}
+
+
+class GeofenceMonitor:
+    """
+    Ground station geofence check. Both fence zones are projected once and flattened into edge arrays, so a single
+    vectorized even-odd ray cast tests every racer against every edge. A racer is in breach when it is outside the
+    inclusion zone or inside the exclusion zone. Callbacks only fire when a racer enters or leaves a breach.
+    Racers are checked from their own telemetry threads, so breach states change and their callbacks fire under a lock.
+    """
+    def __init__(self, fence_map: FenceMap, projection: Optional[TrackProjection] = None):
+        self._projection = projection if projection is not None else fence_map.projection
+
+        # Edges of both zones, inclusion first, as (E, 2) start and end arrays in the east/north plane (meters)
+        _zones = [self._projection.project_zone(fence_map.inclusion_zone),
+                  self._projection.project_zone(fence_map.exclusion_zone)]
+        _starts = np.concatenate(_zones)
+        _ends = np.concatenate([np.roll(_zone, -1, axis=0) for _zone in _zones])
+        self._zone_offsets = np.array([0, len(_zones[0])])
+
+        # Ray cast terms: a ray towards +east from (x, y) crosses an edge if y lies in [y0, y1) (either direction)
+        # and x is left of the edge's x at y. Horizontal edges never satisfy the first test, their slope is unused.
+        _dy = _ends[:, 1] - _starts[:, 1]
+        self._edge_x = _starts[:, 0]
+        self._edge_y = _starts[:, 1]
+        self._edge_end_y = _ends[:, 1]
+        self._edge_slope = (_ends[:, 0] - _starts[:, 0]) / np.where(_dy == 0, 1.0, _dy)
+
+        self._racers: List[int] = []
+        self._telemetries: List[Telemetry] = []
+        self._breached: np.ndarray = np.zeros(0, dtype=bool)
+        self._breach_callbacks: List[typing.Callable] = []
+        self._lock = Lock()
+
+    @property
+    def racers(self):
+        return self._racers
+
+    def add_racer(self, racer_id: int, telemetry_info: Telemetry):
+        with self._lock:
+            self._racers.append(racer_id)
+            self._telemetries.append(telemetry_info)
+            self._breached = np.append(self._breached, False)
+
+    def is_breached(self, racer_id: int) -> bool:
+        return bool(self._breached[self._racers.index(racer_id)])
+
+    def register_breach_callback(self, func: typing.Callable):
+        """
+        :param func: called as func(racer_id, breached) whenever a racer enters (True) or leaves (False) a breach
+        """
+        self._breach_callbacks.append(func)
+
+    def zones_containing(self, points: np.ndarray) -> np.ndarray:
+        """
+        :param points: (P, 2) east/north points, NaN rows are inside no zone
+        :return: (P, 2) bool array, columns: inside the inclusion zone, inside the exclusion zone
+        """
+        _x = points[:, 0, np.newaxis]
+        _y = points[:, 1, np.newaxis]
+
+        _straddles = (self._edge_y <= _y) != (self._edge_end_y <= _y)
+        _crosses = _straddles & (_x < self._edge_x + (_y - self._edge_y) * self._edge_slope)
+
+        # Crossing count of every zone, odd means inside
+        return (np.add.reduceat(_crosses, self._zone_offsets, axis=1) & 1).astype(bool)
+
+    def breaches(self, points: np.ndarray) -> np.ndarray:
+        """
+        :param points: (P, 2) east/north points
+        :return: (P,) True where a point is outside the inclusion zone or inside the exclusion zone. NaN points
+        (no telemetry yet) are never in breach.
+        """
+        _inside = self.zones_containing(points)
+        return ~np.isnan(points[:, 0]) & (~_inside[:, 0] | _inside[:, 1])
+
+    def check(self) -> np.ndarray:
+        """
+        Checks every racer's latest telemetry at once and fires the breach callbacks on every change.
+        :return: (P,) breach state of every racer, in racers order
+        """
+        with self._lock:
+            return self._check(np.arange(len(self._racers)))
+
+    def check_racer(self, racer_id: int) -> bool:
+        """
+        Checks one racer's latest telemetry and fires the breach callbacks if its state changed.
+        :return: breach state of the racer
+        """
+        with self._lock:
+            return bool(self._check(np.array([self._racers.index(racer_id)]))[0])
+
+    def racer_callback(self, racer_id: int) -> typing.Callable[[], bool]:
+        """
+        :return: telemetry callback checking only this racer, so every tick checks the racer that moved
+        """
+        return lambda: self.check_racer(racer_id)
+
+    def _check(self, indices: np.ndarray) -> np.ndarray:
+        """
+        Compares and swaps the breach state of some racers, then fires the callbacks of those that changed. The
+        monitor's lock must be held.
+        :param indices: (K,) positions of the racers, in racers order
+        :return: (K,) breach state of those racers
+        """
+        _coordinates = np.array([(self._telemetries[_ii_index]['lat'], self._telemetries[_ii_index]['lon'])
+                                 for _ii_index in indices.tolist()], dtype=np.float64).reshape(-1, 2)
+        _breached = self.breaches(self._projection.project(_coordinates[:, 0], _coordinates[:, 1]))
+
+        _changed = indices[_breached != self._breached[indices]]
+        self._breached[indices] = _breached
+        for _ii_index in _changed.tolist():
+            for _func in self._breach_callbacks:
+                _func(self._racers[_ii_index], bool(self._breached[_ii_index]))
+        return _breached
 
 
 class Checkpoint:
+    __slots__ = ('_a', '_b', '_midpoint')
+
     def __init__(self, a_vertex: Vertex, b_vertex: Vertex):
         self._a = a_vertex
         self._b = b_vertex
@@ -194,6 +1064,8 @@ class Checkpoint:
 
 
 class TrackableCheckpoint(Checkpoint):
+    __slots__ = ('_crossed',)
+
     def __init__(self, a_vertex: Vertex, b_vertex: Vertex):
         super().__init__(a_vertex, b_vertex)
         self._crossed = False
@@ -209,6 +1081,159 @@ class TrackableCheckpoint(Checkpoint):
         self._crossed = False
 
 
+class CheckpointSet:
+    """
+    Compact, array-backed sequence of checkpoints. Endpoints are stored as one contiguous float64 array of shape
+    (N, 2, 2), indexed as [checkpoint][a/b][lat/lon], and midpoints as (N, 2). Indexing and iteration still yield
+    Checkpoint instances, built on first access.
+    """
+    __slots__ = ('_endpoints', '_midpoints', '_checkpoints')
+
+    def __init__(self, endpoints):
+        self._endpoints = np.ascontiguousarray(endpoints, dtype=np.float64).reshape(-1, 2, 2)
+        self._endpoints.flags.writeable = False
+        self._midpoints = self._endpoints.mean(axis=1)
+        self._midpoints.flags.writeable = False
+        self._checkpoints: Optional[List[Checkpoint]] = None
+
+    @classmethod
+    def from_checkpoints(cls, checkpoints: typing.Iterable[Checkpoint]) -> CheckpointSet:
+        return cls([[_vertex.tuple for _vertex in _checkpoint.endpoints] for _checkpoint in checkpoints])
+
+    @classmethod
+    def of(cls, checkpoints: typing.Union[CheckpointSet, typing.Iterable[Checkpoint]]) -> CheckpointSet:
+        if isinstance(checkpoints, CheckpointSet):
+            return checkpoints
+        return cls.from_checkpoints(checkpoints)
+
+    @property
+    def endpoints(self):
+        return self._endpoints
+
+    @property
+    def midpoints(self):
+        return self._midpoints
+
+    @property
+    def checkpoints(self) -> List[Checkpoint]:
+        if self._checkpoints is None:
+            self._checkpoints = [Checkpoint(Vertex(*_a), Vertex(*_b)) for _a, _b in self._endpoints.tolist()]
+        return self._checkpoints
+
+    def rotate(self, positions: int) -> CheckpointSet:
+        return CheckpointSet(np.roll(self._endpoints, positions, axis=0))
+
+    def __len__(self):
+        return len(self._endpoints)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return CheckpointSet(self._endpoints[index])
+        return self.checkpoints[index]
+
+    def __iter__(self):
+        return iter(self.checkpoints)
+
+
+class CheckpointGrid:
+    """
+    Uniform grid spatial index over projected checkpoint segments. Every gate is registered in each cell its bounding
+    box touches, so a query only looks at the gates of the cells around the query point or segment.
+    """
+    def __init__(self, endpoints: np.ndarray, cell_size: float = CHECKPOINT_GRID_CELL_METERS):
+        """
+        :param endpoints: (N, 2, 2) array of projected gate endpoints, as [checkpoint][a/b][east/north]
+        :param cell_size: cell side in meters
+        """
+        self._endpoints = np.asarray(endpoints, dtype=np.float64)
+        self._cell_size = cell_size
+        self._cells: typing.Dict[typing.Tuple[int, int], typing.List[int]] = {}
+
+        _lower_cells = np.floor(self._endpoints.min(axis=1) / cell_size).astype(int).tolist()
+        _upper_cells = np.floor(self._endpoints.max(axis=1) / cell_size).astype(int).tolist()
+        for _ii_gate, ((_x_min, _y_min), (_x_max, _y_max)) in enumerate(zip(_lower_cells, _upper_cells)):
+            for _ii_x in range(_x_min, _x_max + 1):
+                for _ii_y in range(_y_min, _y_max + 1):
+                    self._cells.setdefault((_ii_x, _ii_y), []).append(_ii_gate)
+
+        if len(self._endpoints):
+            self._cell_bounds = (np.min(_lower_cells, axis=0), np.max(_upper_cells, axis=0))
+        else:
+            self._cell_bounds = (np.zeros(2, dtype=int), np.zeros(2, dtype=int))
+
+    @property
+    def endpoints(self):
+        return self._endpoints
+
+    @property
+    def cell_size(self):
+        return self._cell_size
+
+    def _cell(self, point) -> typing.Tuple[int, int]:
+        return floor(point[0] / self._cell_size), floor(point[1] / self._cell_size)
+
+    def candidates_in_box(self, lower, upper) -> np.ndarray:
+        """
+        Indices of the gates registered in any cell touched by the lower-upper bounding box.
+        """
+        # Clamped to the cells holding gates, so the cost of a query never exceeds the track's size
+        _lower_bound, _upper_bound = self._cell_bounds
+        _x_min, _y_min = np.maximum(self._cell(lower), _lower_bound).tolist()
+        _x_max, _y_max = np.minimum(self._cell(upper), _upper_bound).tolist()
+        _candidates = set()
+        for _ii_x in range(_x_min, _x_max + 1):
+            for _ii_y in range(_y_min, _y_max + 1):
+                _candidates.update(self._cells.get((_ii_x, _ii_y), ()))
+        return np.fromiter(sorted(_candidates), dtype=int, count=len(_candidates))
+
+    def segment_candidates(self, start, end) -> np.ndarray:
+        """
+        Indices of the gates that may intersect the start-end segment.
+        """
+        return self.candidates_in_box(np.minimum(start, end), np.maximum(start, end))
+
+    def nearest(self, position, count: int = 1) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+        Gates nearest to a projected position, searching rings of cells outwards until no unvisited cell can hold a
+        closer gate.
+        :return: (indices, distances) of at most count gates, closest first
+        """
+        _center_x, _center_y = self._cell(position)
+        (_x_low, _y_low), (_x_high, _y_high) = (_bound.tolist() for _bound in self._cell_bounds)
+        _max_ring = int(max(abs(_center_x - _x_low), abs(_center_x - _x_high),
+                            abs(_center_y - _y_low), abs(_center_y - _y_high)))
+        # Rings closer than the cells holding gates are empty, e.g. for a position far off the track
+        _min_ring = max(_x_low - _center_x, _center_x - _x_high, _y_low - _center_y, _center_y - _y_high, 0)
+
+        _candidates = set()
+        _indices = np.empty(0, dtype=int)
+        _distances = np.empty(0, dtype=np.float64)
+        for _ii_ring in range(_min_ring, _max_ring + 1):
+            # Only the part of the ring inside the cells holding gates
+            for _ii_x in range(max(_center_x - _ii_ring, _x_low), min(_center_x + _ii_ring, _x_high) + 1):
+                if abs(_ii_x - _center_x) == _ii_ring:
+                    _ring_cells = range(max(_center_y - _ii_ring, _y_low), min(_center_y + _ii_ring, _y_high) + 1)
+                else:
+                    _ring_cells = [_ii_y for _ii_y in (_center_y - _ii_ring, _center_y + _ii_ring)
+                                   if _y_low <= _ii_y <= _y_high]
+                for _ii_y in _ring_cells:
+                    _candidates.update(self._cells.get((_ii_x, _ii_y), ()))
+
+            # Every gate outside the visited rings is at least _ii_ring cells away
+            if len(_candidates) >= count:
+                _indices = np.fromiter(_candidates, dtype=int, count=len(_candidates))
+                _distances = point_segment_distances(position, self._endpoints[_indices, 0],
+                                                     self._endpoints[_indices, 1])
+                if np.partition(_distances, count - 1)[count - 1] <= _ii_ring * self._cell_size:
+                    break
+
+        if len(_indices) < len(_candidates):
+            _indices = np.fromiter(_candidates, dtype=int, count=len(_candidates))
+            _distances = point_segment_distances(position, self._endpoints[_indices, 0], self._endpoints[_indices, 1])
+        _order = np.argsort(_distances, kind='stable')[:count]
+        return _indices[_order], _distances[_order]
+
+
 class Seeker:
     def __init__(self, starting_point: Vertex, starting_zone_absolute: int,
                  autopilot_controller, final_height: float):
@@ -310,6 +1335,8 @@ class Racer:
 
 
 class Vertex:
+    __slots__ = ('_lat', '_lon', '_elevation')
+
     def __init__(self, lat, lon, elevation=None):
         self._lat = lat
         self._lon = lon
@@ -343,54 +1370,54 @@ class Vertex:
 
 
 class TrackLength:
-    def __init__(self, checkpoints: List[Checkpoint]):
-        self._checkpoints = checkpoints
-        self._lengths = [0]
+    def __init__(self, checkpoints: typing.Union[CheckpointSet, List[Checkpoint]],
+                 lengths: typing.Optional[np.ndarray] = None):
+        """
+        :param checkpoints: track checkpoints, in racing order
+        :param lengths: precomputed cumulative lengths (N + 1,), e.g. from a compiled track. Computed if None.
+        """
+        self._checkpoints = CheckpointSet.of(checkpoints)
+        _midpoints = self._checkpoints.midpoints
+        self._midpoints = _midpoints
 
-        ii_starting_length = 0
-        for ii_checkpoint in range(len(self._checkpoints)):
-            _current_checkpoint = self._checkpoints[ii_checkpoint]
-            try:
-                _next_checkpoint = self._checkpoints[ii_checkpoint + 1]
-            except IndexError:
-                _next_checkpoint = self._checkpoints[0]
+        if lengths is not None:
+            if len(lengths) != len(self._checkpoints) + 1:
+                raise ValueError(f'Expected {len(self._checkpoints) + 1} cumulative lengths, got {len(lengths)}')
+            self._lengths = np.asarray(lengths, dtype=np.float64)
+            return
 
-            _current_vertex = _current_checkpoint.midpoint
-            _next_vertex = _next_checkpoint.midpoint
+        # Distance between every checkpoint midpoint and the next one, wrapping around the last checkpoint
+        _next_midpoints = np.roll(_midpoints, -1, axis=0)
+        _distances = self.distances(_midpoints[:, 0], _midpoints[:, 1], _next_midpoints[:, 0], _next_midpoints[:, 1])
 
-            _distance = self.distance(_current_vertex, _next_vertex)
-            self._lengths.append(_distance + ii_starting_length)
-            ii_starting_length += _distance
+        # Cumulative lengths, sorted by construction, so zones can be found with a binary search
+        self._lengths = np.concatenate(([0.0], np.cumsum(_distances)))
 
     @property
     def track_length(self):
-        return self._lengths[-1]
+        return float(self._lengths[-1])
 
     @property
     def lengths(self):
         return self._lengths
 
+    @property
+    def zone_lengths(self):
+        return np.diff(self._lengths)
+
     @property
     def checkpoints(self):
         return self._checkpoints
 
-    def distance_to_passed_waypoint(self, distance_meters: float):
-        for ii_distance in range(len(self._lengths)):
-            try:
-                _next_distance = self._lengths[ii_distance + 1]
-            except IndexError:
-                _next_distance = self._lengths[(ii_distance + 1) % len(self._lengths)]
-            if _next_distance > distance_meters:
-                return distance_meters - self._lengths[ii_distance]
-
-    def distance_to_next_waypoint(self, distance_meters: float):
-        for ii_distance in range(len(self._lengths)):
-            try:
-                _next_distance = self._lengths[ii_distance + 1]
-            except IndexError:
-                _next_distance = self._lengths[(ii_distance + 1) % len(self._lengths)]
-            if _next_distance > distance_meters:
-                return _next_distance - distance_meters
+    @property
+    def midpoints(self):
+        return self._midpoints
+
+    def distance_to_passed_waypoint(self, distance_meters: float) -> float:
+        return float(self.distances_to_passed_waypoint(distance_meters))
+
+    def distance_to_next_waypoint(self, distance_meters: float) -> float:
+        return float(self.distances_to_next_waypoint(distance_meters))
 
     def zone_boundaries_separation(self, start_distance_meters: float, separation: float):
         _lower_separation = self.distance_to_passed_waypoint(start_distance_meters)
@@ -398,10 +1425,31 @@ class TrackLength:
         return _lower_separation >= separation and _upper_separation >= separation
 
     def get_track_zone(self, distance_meters: float) -> int:
-        _track_lengths = self.lengths
-        for ii_index in range(len(_track_lengths)):
-            if _track_lengths[ii_index] <= distance_meters < _track_lengths[ii_index + 1]:
-                return ii_index
+        return int(self.get_track_zones(distance_meters))
+
+    def wrap_distances(self, distances_meters) -> np.ndarray:
+        """
+        Distances along the track are taken modulo the lap length.
+        """
+        return np.mod(distances_meters, self._lengths[-1])
+
+    def get_track_zones(self, distances_meters) -> np.ndarray:
+        """
+        Batch zone lookup. Zone i holds every distance d with lengths[i] <= d < lengths[i + 1].
+        :param distances_meters: scalar or array of distances from checkpoint 0
+        """
+        _distances = self.wrap_distances(distances_meters)
+        return np.searchsorted(self._lengths, _distances, side='right') - 1
+
+    def distances_to_passed_waypoint(self, distances_meters) -> np.ndarray:
+        _distances = self.wrap_distances(distances_meters)
+        _zones = np.searchsorted(self._lengths, _distances, side='right') - 1
+        return _distances - self._lengths[_zones]
+
+    def distances_to_next_waypoint(self, distances_meters) -> np.ndarray:
+        _distances = self.wrap_distances(distances_meters)
+        _zones = np.searchsorted(self._lengths, _distances, side='right') - 1
+        return self._lengths[_zones + 1] - _distances
 
     @staticmethod
     def parametrize(point_start: Vertex, point_end: Vertex):
@@ -412,57 +1460,135 @@ class TrackLength:
              point_start.lon + _increment * _direction_lon)
 
     @staticmethod
-    def distance(point_start: Vertex, point_end: Vertex):
-        _start_lat = radians(point_start.lat)
-        _end_lat = radians(point_end.lat)
+    def distance(point_start: Vertex, point_end: Vertex) -> float:
+        return float(TrackLength.distances(point_start.lat, point_start.lon, point_end.lat, point_end.lon))
+
+    @staticmethod
+    def distances(start_lat, start_lon, end_lat, end_lon) -> np.ndarray:
+        """
+        Vectorized haversine distance in meters. Coordinates are in degrees and may be scalars or arrays of any shape,
+        as long as they broadcast against each other.
+        """
+        _start_lat = np.radians(start_lat)
+        _end_lat = np.radians(end_lat)
 
         _lat_diff = _end_lat - _start_lat
-        _lon_diff = radians(point_end.lon - point_start.lon)
+        _lon_diff = np.radians(np.subtract(end_lon, start_lon))
 
-        _a = sin(_lat_diff / 2) ** 2 + cos(_start_lat) * cos(_end_lat) * sin(_lon_diff / 2) ** 2
-        _c = 2 * asin(sqrt(_a))
+        _a = np.sin(_lat_diff / 2) ** 2 + np.cos(_start_lat) * np.cos(_end_lat) * np.sin(_lon_diff / 2) ** 2
+        _c = 2 * np.arcsin(np.sqrt(np.clip(_a, 0, 1)))
 
         _distance = EARTH_RADIUS_METERS * _c
         return _distance
 
+    @staticmethod
+    def distance_matrix(start_coordinates, end_coordinates) -> np.ndarray:
+        """
+        Haversine distance in meters between every pair of points of two coordinate sets.
+        :param start_coordinates: (N, 2) array-like of (lat, lon) rows, e.g. racer positions
+        :param end_coordinates: (M, 2) array-like of (lat, lon) rows, e.g. checkpoint midpoints
+        :return: (N, M) array
+        """
+        _start = np.asarray(start_coordinates, dtype=np.float64).reshape(-1, 2)
+        _end = np.asarray(end_coordinates, dtype=np.float64).reshape(-1, 2)
+        return TrackLength.distances(_start[:, np.newaxis, 0], _start[:, np.newaxis, 1], _end[:, 0], _end[:, 1])
+
+
+class TrackProjection:
+    """
+    Local tangent plane projection anchored at a track's reference vertex (the fence home). Converts geodetic
+    coordinates into (east, north) meters so race math becomes planar arithmetic. Uses the equirectangular
+    approximation, which stays well under a centimeter of error over circuit-sized areas.
+    """
+    def __init__(self, origin: Vertex):
+        self._origin = origin
+
+        self._origin_lat = origin.lat
+        self._origin_lon = origin.lon
+        self._meters_per_degree_lat = radians(EARTH_RADIUS_METERS)
+        self._meters_per_degree_lon = radians(EARTH_RADIUS_METERS) * cos(radians(origin.lat))
+
+    @property
+    def origin(self):
+        return self._origin
+
+    def project(self, lat, lon) -> np.ndarray:
+        """
+        Project degrees into meters. Accepts scalars or broadcastable arrays.
+        :return: array of shape (..., 2) with (east, north) in the last axis
+        """
+        _east = np.subtract(lon, self._origin_lon) * self._meters_per_degree_lon
+        _north = np.subtract(lat, self._origin_lat) * self._meters_per_degree_lat
+        return np.stack([_east, _north], axis=-1)
+
+    def unproject(self, east, north) -> Tuple[np.ndarray, np.ndarray]:
+        _lat = self._origin_lat + np.divide(north, self._meters_per_degree_lat)
+        _lon = self._origin_lon + np.divide(east, self._meters_per_degree_lon)
+        return _lat, _lon
+
+    def project_coordinates(self, coordinates) -> np.ndarray:
+        """
+        :param coordinates: (..., 2) array-like of (lat, lon) rows
+        """
+        _coordinates = np.asarray(coordinates, dtype=np.float64)
+        return self.project(_coordinates[..., 0], _coordinates[..., 1])
+
+    def project_vertices(self, vertices: List[Vertex]) -> np.ndarray:
+        return self.project_coordinates(np.array([_vertex.tuple for _vertex in vertices], dtype=np.float64)
+                                        .reshape(-1, 2))
+
+    def project_zone(self, zone: FenceZone) -> np.ndarray:
+        return self.project_coordinates(zone.array)
+
+    def project_checkpoints(self, checkpoints: typing.Union[CheckpointSet, List[Checkpoint]]) -> np.ndarray:
+        """
+        :return: (N, 2, 2) array of checkpoint endpoints, as [checkpoint][a/b][east/north]
+        """
+        return self.project_coordinates(CheckpointSet.of(checkpoints).endpoints)
+
+    def project_telemetry(self, telemetry: Telemetry) -> np.ndarray:
+        return self.project(telemetry['lat'], telemetry['lon'])
+
+    @staticmethod
+    def planar_distances(start, end) -> np.ndarray:
+        """
+        Euclidean distance in meters between projected points, broadcasting over the leading axes.
+        """
+        _difference = np.subtract(end, start)
+        return np.hypot(_difference[..., 0], _difference[..., 1])
+
 
 class StartingPoints:
     def __init__(self, track_length: TrackLength, player_count: int):
         self._track_length = track_length
 
+        # Racers are evenly spread around the lap, all shifted by a common start distance
         _racer_separation = track_length.track_length / player_count
-        _racer_starting_positions: List[Optional[Vertex]] = [None] * player_count
-        _racer_starting_distances: List[Optional[float]] = [None] * player_count
-        _racer_starting_zones: List[Optional[int]] = [None] * player_count
-
-        _ii_starting_distance = 0
-        _have_separation = False
-        _count = 0
-        while not _have_separation or _count > LOOP_CEILING:
-            _starting_distance = _ii_starting_distance
+        _racer_offsets = np.arange(player_count) * _racer_separation
 
-            # Calculate starting points distances from checkpoint 0
-            for _ii_racer in range(player_count):
-                _racer_starting_distances[_ii_racer] = _starting_distance + _ii_racer * _racer_separation
+        _starting_distance = self._solve_starting_distance(_racer_offsets, CHECKPOINT_SEPARATION_UNITS)
+        if _starting_distance is None:
+            raise ValueError(f'No starting placement for {player_count} player(s) keeps '
+                             f'{CHECKPOINT_SEPARATION_UNITS} m away from every checkpoint')
 
-            # Check if there is separation between checkpoints
-            _separations = [False] * player_count
-            for _ii_racer in range(player_count):
-                _separations[_ii_racer] = self._track_length.zone_boundaries_separation(_ii_starting_distance,
-                                                                                        CHECKPOINT_SEPARATION_UNITS)
+        _racer_starting_distances = self._track_length.wrap_distances(_starting_distance + _racer_offsets)
+        _racer_starting_positions, _racer_starting_zones = self._starting_points_at(_racer_starting_distances)
 
-            _have_separation = all(_separations)
-            _ii_starting_distance += CHECKPOINT_SEPARATION_INTERVAL_METERS
-            _count += 1
+        self._starting_points: List[Vertex] = _racer_starting_positions
+        self._starting_zones: List[int] = _racer_starting_zones
 
-        for _ii_racer in range(player_count):
-            _racer_starting_position, _racer_starting_zone = self._starting_point(
-                _racer_starting_distances[_ii_racer])
-            _racer_starting_positions[_ii_racer] = _racer_starting_position
-            _racer_starting_zones[_ii_racer] = _racer_starting_zone
-
-        self._starting_points = _racer_starting_positions
-        self._starting_zones = _racer_starting_zones
+    @classmethod
+    def from_arrays(cls, track_length: TrackLength, points: np.ndarray, zones: np.ndarray) -> StartingPoints:
+        """
+        Rebuilds already solved starting points, e.g. from a compiled track, without solving the placement again.
+        :param points: (P, 2) lat, lon starting coordinates
+        :param zones: (P,) starting zone of every racer
+        """
+        _starting_points = cls.__new__(cls)
+        _starting_points._track_length = track_length
+        _starting_points._starting_points = [Vertex(_lat, _lon) for _lat, _lon in np.asarray(points).tolist()]
+        _starting_points._starting_zones = [int(_zone) for _zone in zones]
+        return _starting_points
 
     @property
     def starting_points(self):
@@ -476,25 +1602,161 @@ class StartingPoints:
     def track_length(self):
         return self._track_length
 
-    def _starting_point(self, distance_from_start) -> Tuple[Vertex, int]:
-        # Compute starting point
-        _starting_zone = self._track_length.get_track_zone(distance_from_start)
+    @property
+    def operating_heights(self) -> List[float]:
+        return operating_heights(len(self._starting_points)).tolist()
+
+    def _solve_starting_distance(self, racer_offsets: np.ndarray, separation: float) -> Optional[float]:
+        """
+        Smallest start distance s such that every racer, placed at s + offset, is at least separation meters away
+        from both checkpoints of its zone. Each racer admits a set of intervals for s (the valid stretch of every
+        zone, shifted back by its offset), so the answer is the start of the intersection of all of them.
+        """
+        _lengths = self._track_length.lengths
+        _period = self._track_length.track_length
+
+        # Valid stretch of every zone, dropping zones too short to hold a racer
+        _valid = np.column_stack((_lengths[:-1] + separation, _lengths[1:] - separation))
+        _valid = _valid[_valid[:, 0] <= _valid[:, 1]]
+
+        _intervals = np.array([[0.0, _period]])
+        for _offset in racer_offsets:
+            _intervals = self._intersect_intervals(_intervals, self._shift_intervals(_valid, _offset, _period))
+            if not len(_intervals):
+                return None
+        return float(_intervals[0, 0])
+
+    @staticmethod
+    def _shift_intervals(intervals: np.ndarray, offset: float, period: float) -> np.ndarray:
+        """
+        Shifts [lower, upper] intervals back by offset, modulo period, splitting the ones that wrap around.
+        :return: sorted, disjoint (K, 2) array within [0, period]
+        """
+        _lower = np.mod(intervals[:, 0] - offset, period)
+        _upper = _lower + (intervals[:, 1] - intervals[:, 0])
 
-        _start_checkpoint = self._track_length.checkpoints[_starting_zone]
-        try:
-            _end_checkpoint = self._track_length.checkpoints[_starting_zone + 1]
-        except IndexError:
-            _end_checkpoint = self._track_length.checkpoints[(_starting_zone + 1) % len(self._track_length.checkpoints)]
+        _wrapped = _upper > period
+        _shifted = np.concatenate((
+            np.column_stack((_lower, np.minimum(_upper, period))),
+            np.column_stack((np.zeros(np.count_nonzero(_wrapped)), _upper[_wrapped] - period))
+        ))
+        return _shifted[np.argsort(_shifted[:, 0], kind='stable')]
 
-        _parametrizer = self._track_length.parametrize(_start_checkpoint.midpoint, _end_checkpoint.midpoint)
+    @staticmethod
+    def _intersect_intervals(a_intervals: np.ndarray, b_intervals: np.ndarray) -> np.ndarray:
+        """
+        Intersection of two sorted, disjoint interval sets. Overlapping pairs are found with binary searches.
+        """
+        _first = np.searchsorted(b_intervals[:, 1], a_intervals[:, 0], side='left')
+        _last = np.searchsorted(b_intervals[:, 0], a_intervals[:, 1], side='right')
+        _counts = np.maximum(_last - _first, 0)
+
+        _a_index = np.repeat(np.arange(len(a_intervals)), _counts)
+        _b_index = np.arange(_counts.sum()) - np.repeat(np.cumsum(_counts) - _counts, _counts) + \
+            np.repeat(_first, _counts)
+
+        _lower = np.maximum(a_intervals[_a_index, 0], b_intervals[_b_index, 0])
+        _upper = np.minimum(a_intervals[_a_index, 1], b_intervals[_b_index, 1])
+        _overlapping = _lower <= _upper
+        return np.column_stack((_lower[_overlapping], _upper[_overlapping]))
+
+    def _starting_points_at(self, distances_from_start: np.ndarray) -> Tuple[List[Vertex], List[int]]:
+        # Interpolate every racer between the midpoints of its zone's checkpoints
+        _starting_zones = self._track_length.get_track_zones(distances_from_start)
+        _zone_lengths = self._track_length.zone_lengths[_starting_zones]
+        _multipliers = self._track_length.distances_to_passed_waypoint(distances_from_start) / _zone_lengths
+
+        _midpoints = self._track_length.midpoints
+        _start_midpoints = _midpoints[_starting_zones]
+        _end_midpoints = _midpoints[(_starting_zones + 1) % len(_midpoints)]
+        _starting_coordinates = _start_midpoints + _multipliers[:, np.newaxis] * (_end_midpoints - _start_midpoints)
+
+        _starting_points = [Vertex(_lat, _lon) for _lat, _lon in _starting_coordinates.tolist()]
+        return _starting_points, _starting_zones.tolist()
+
+
+class StartingGrid(StartingPoints):
+    """
+    Starting formation for larger fields. Racers line up behind the pole position in rows across the track:
+    'grid' fills rows of columns racers side by side, 'staggered' places every racer a fraction of a row behind the
+    previous one, alternating columns. Columns are centered across the local track width, lateral_spacing meters
+    apart and at least half of it from the borders. Fewer columns are used if the track is too narrow.
+    The whole formation is shifted along the lap, in one batched solve, until no racer is closer than clearance
+    meters to a checkpoint.
+    """
+    FORMATIONS = ('grid', 'staggered')
+
+    def __init__(self, track_length: TrackLength, player_count: int, formation: str = STARTING_GRID_FORMATION,
+                 columns: int = STARTING_GRID_COLUMNS, row_spacing: float = STARTING_GRID_ROW_SPACING_METERS,
+                 lateral_spacing: float = STARTING_GRID_LATERAL_SPACING_METERS,
+                 clearance: float = CHECKPOINT_CROSSING_THRESHOLD_METERS):
+        if formation not in self.FORMATIONS:
+            raise ValueError(f'Unknown formation {formation}, expected one of {self.FORMATIONS}')
+        self._track_length = track_length
+        self._formation = formation
 
-        try:
-            _zone_length = self._track_length.lengths[_starting_zone + 1]
-        except IndexError:
-            _zone_length = self._track_length.lengths[(_starting_zone + 1) % len(self._track_length.lengths)]
-        _multiplier = self._track_length.distance_to_passed_waypoint(distance_from_start) / _zone_length
-        _starting_point = Vertex(*_parametrizer(_multiplier))
-        return _starting_point, _starting_zone
+        _projection = TrackProjection(Vertex(*track_length.midpoints[0].tolist()))
+        _endpoints = _projection.project_checkpoints(track_length.checkpoints)
+        _order = np.arange(player_count)
+
+        for _ii_columns in range(max(1, columns), 0, -1):
+            _column_index = _order % _ii_columns
+            if formation == 'grid':
+                _racer_offsets = -(_order // _ii_columns) * row_spacing
+            else:
+                _racer_offsets = -_order * row_spacing / _ii_columns
+            if -_racer_offsets[-1] >= track_length.track_length:
+                continue
+
+            _starting_distance = self._solve_starting_distance(_racer_offsets, clearance)
+            if _starting_distance is None:
+                continue
+            _distances = self._track_length.wrap_distances(_starting_distance + _racer_offsets)
+
+            # Local gate through every racer's position, interpolated between the checkpoints of its zone
+            _zones = self._track_length.get_track_zones(_distances)
+            _multipliers = self._track_length.distances_to_passed_waypoint(_distances) / \
+                self._track_length.zone_lengths[_zones]
+            _start_gates = _endpoints[_zones]
+            _end_gates = _endpoints[(_zones + 1) % len(_endpoints)]
+            _gates = _start_gates + _multipliers[:, np.newaxis, np.newaxis] * (_end_gates - _start_gates)
+
+            _widths = TrackProjection.planar_distances(_gates[:, 0], _gates[:, 1])
+            if np.any(_widths < _ii_columns * lateral_spacing):
+                continue
+
+            _lateral_offsets = (_column_index - (_ii_columns - 1) / 2) * lateral_spacing
+            _centers = _gates.mean(axis=1)
+            _positions = _centers + (_lateral_offsets / _widths)[:, np.newaxis] * (_gates[:, 1] - _gates[:, 0])
+            _lat, _lon = _projection.unproject(_positions[:, 0], _positions[:, 1])
+
+            self._columns = _ii_columns
+            self._starting_points: List[Vertex] = [Vertex(*_point) for _point in zip(_lat.tolist(), _lon.tolist())]
+            self._starting_zones: List[int] = _zones.tolist()
+            return
+
+        raise ValueError(f'No {formation} formation for {player_count} player(s) fits the track with '
+                         f'{lateral_spacing} m lateral spacing and {clearance} m clearance from every checkpoint')
+
+    @classmethod
+    def from_arrays(cls, track_length: TrackLength, points: np.ndarray, zones: np.ndarray,
+                    formation: str = STARTING_GRID_FORMATION, columns: int = STARTING_GRID_COLUMNS) -> StartingGrid:
+        """
+        Rebuilds an already solved formation, see StartingPoints.from_arrays.
+        :param columns: columns the formation was solved with
+        """
+        _starting_grid = super().from_arrays(track_length, points, zones)
+        _starting_grid._formation = formation
+        _starting_grid._columns = columns
+        return _starting_grid
+
+    @property
+    def formation(self):
+        return self._formation
+
+    @property
+    def columns(self):
+        return self._columns
 
 
 class MavlinkParameters:
@@ -514,10 +1776,18 @@ class FenceMap:
         self._inclusion_zone: typing.Optional[FenceZone] = None
         self._exclusion_zone: typing.Optional[FenceZone] = None
 
+        self._projection: typing.Optional[TrackProjection] = None
+
     @property
     def home(self):
         return self._home
 
+    @property
+    def projection(self):
+        if self._projection is None and self._home is not None:
+            self._projection = TrackProjection(self._home)
+        return self._projection
+
     @property
     def inclusion_zone(self):
         return self._inclusion_zone
@@ -540,6 +1810,7 @@ class FenceMap:
 
     def clear_home(self):
         self._home = None
+        self._projection = None
 
     def set_inclusion_zone(self, inclusion_zone: FenceZone):
         if self._inclusion_zone is None:
@@ -563,22 +1834,55 @@ class FenceMap:
 
 
 class FenceZone:
-    def __init__(self):
+    """
+    Fence polygon. Vertex coordinates live in a contiguous (N, 2) float64 (lat, lon) array that grows by doubling;
+    the Vertex and tuple lists are built from it on demand and cached until the next insert.
+    Membership goes through a hash index of the coordinates. With a quantization step, coordinates are bucketed in
+    cells of that size and two vertices closer than the step in both latitude and longitude are the same vertex.
+    """
+    __slots__ = ('_type', '_closed', '_coordinates', '_count', '_vertices', '_tuple_list', '_quantization',
+                 '_index', '_significance', '_simplified')
+
+    _INITIAL_CAPACITY = 16
+
+    def __init__(self, quantization: typing.Optional[float] = FENCE_VERTEX_QUANTIZATION_DEGREES):
         self._type: typing.Optional[bool] = None  # 0/False: exclusion, 1/True: inclusion
         self._closed: bool = False
-        self._vertices: typing.List[Vertex] = []
+        self._coordinates: np.ndarray = np.empty((self._INITIAL_CAPACITY, 2), dtype=np.float64)
+        self._count: int = 0
+
+        self._quantization = quantization
+        self._index: typing.Dict[typing.Tuple, int] = {}
+
+        self._vertices: typing.Optional[typing.List[Vertex]] = None
+        self._tuple_list: typing.Optional[typing.List[typing.Tuple[float, float]]] = None
+
+        # Douglas-Peucker significance of every vertex (meters) and simplified tuple lists per zoom level
+        self._significance: typing.Optional[np.ndarray] = None
+        self._simplified: typing.Dict[typing.Tuple[int, float], typing.List[typing.Tuple[float, float]]] = {}
 
     @property
     def type(self):
         return self._type
 
+    @property
+    def array(self) -> np.ndarray:
+        """
+        Read-only (N, 2) view of the vertex coordinates, without copying.
+        """
+        _view = self._coordinates[:self._count]
+        _view.flags.writeable = False
+        return _view
+
     @property
     def vertices(self):
+        if self._vertices is None:
+            self._vertices = [Vertex(_lat, _lon) for _lat, _lon in self.array.tolist()]
         return self._vertices
 
     @property
     def count(self):
-        return len(self._vertices)
+        return self._count
 
     @property
     def closed(self):
@@ -586,21 +1890,93 @@ class FenceZone:
 
     @property
     def tuple_list(self):
-        return [_vertex.tuple for _vertex in self._vertices]
+        if self._tuple_list is None:
+            self._tuple_list = [(_lat, _lon) for _lat, _lon in self.array.tolist()]
+        return self._tuple_list
+
+    @property
+    def quantization(self):
+        return self._quantization
 
     def close(self):
         self._closed = True
 
+    def clear(self):
+        """
+        Removes every vertex and reopens the zone. The type is kept.
+        """
+        self._closed = False
+        self._count = 0
+        self._index.clear()
+
+        self._vertices = None
+        self._tuple_list = None
+        self._significance = None
+        self._simplified = {}
+
+    def simplified(self, zoom: float, pixel_tolerance: float = POLYGON_SIMPLIFICATION_PIXELS):
+        """
+        Tuple list of the vertices that matter at a map zoom level: the polygon simplified with a tolerance of
+        pixel_tolerance screen pixels. Vertex significances are computed once and every zoom level is cached.
+        :param zoom: map zoom level, rounded like the map widget does
+        """
+        _zoom = round(zoom)
+        _key = (_zoom, pixel_tolerance)
+        if _key in self._simplified:
+            return self._simplified[_key]
+
+        if self._count <= 3:
+            self._simplified[_key] = self.tuple_list
+            return self._simplified[_key]
+
+        _array = self.array
+        if self._significance is None:
+            _projection = TrackProjection(Vertex(*_array[0].tolist()))
+            self._significance = simplification_significance(_projection.project(_array[:, 0], _array[:, 1]))
+
+        _tolerance = pixel_tolerance * meters_per_pixel(float(_array[0, 0]), _zoom)
+        _tuple_list = self.tuple_list
+        self._simplified[_key] = [_tuple_list[_ii_index]
+                                  for _ii_index in np.flatnonzero(self._significance > _tolerance).tolist()]
+        return self._simplified[_key]
+
+    def _key(self, lat: float, lon: float) -> typing.Tuple:
+        if self._quantization is None:
+            return lat, lon
+        return floor(lat / self._quantization), floor(lon / self._quantization)
+
+    def _find(self, vertex: Vertex) -> typing.Optional[int]:
+        _lat, _lon = vertex.tuple
+        _key = self._key(_lat, _lon)
+        if self._quantization is None:
+            return self._index.get(_key)
+
+        # A near-duplicate may sit across a cell border, so the neighbouring cells are also checked
+        for _ii_lat_cell in (_key[0] - 1, _key[0], _key[0] + 1):
+            for _ii_lon_cell in (_key[1] - 1, _key[1], _key[1] + 1):
+                _row = self._index.get((_ii_lat_cell, _ii_lon_cell))
+                if _row is not None:
+                    _row_lat, _row_lon = self._coordinates[_row]
+                    if abs(_row_lat - _lat) < self._quantization and abs(_row_lon - _lon) < self._quantization:
+                        return _row
+        return None
+
     def in_vertices(self, vertex: Vertex):
-        for ii_vertex in self._vertices:
-            if (ii_vertex.lat == vertex.lat) and (ii_vertex.lon == vertex.lon):
-                return True
-        return False
+        return self._find(vertex) is not None
 
     def add_vertex(self, vertex: Vertex):
         if not self._closed:
             if not self.in_vertices(vertex):
-                self._vertices.append(vertex)
+                if self._count == len(self._coordinates):
+                    self._coordinates = np.resize(self._coordinates, (2 * len(self._coordinates), 2))
+                self._coordinates[self._count] = vertex.tuple
+                self._index.setdefault(self._key(*vertex.tuple), self._count)
+                self._count += 1
+
+                self._vertices = None
+                self._tuple_list = None
+                self._significance = None
+                self._simplified = {}
                 return True
         return False
 
@@ -612,10 +1988,16 @@ class FenceZone:
 
     def __str__(self):
         return f'FenceZone(type: {self._type}, closed: {self._closed}, ' \
-               f'points: {[_vertex.__str__() for _vertex in self._vertices]})'
+               f'points: {[_vertex.__str__() for _vertex in self.vertices]})'
 
 
 class MissionItem:
+    """
+    An item of a .waypoints file. An item read from a line keeps the line and only splits it into fields on first
+    access, and the float conversions of its coordinates are cached.
+    """
+    __slots__ = ('_line', '_fields', '_numbers')
+
     def __init__(self, fromstr: typing.Union[str, None] = None,
                  index: typing.Union[str, None] = None,
                  current_wp: typing.Union[str, None] = None,
@@ -629,73 +2011,96 @@ class MissionItem:
                  param6: typing.Union[str, None] = None,
                  param7: typing.Union[str, None] = None,
                  autocontinue: typing.Union[str, None] = None):
+        # Line the item was read from, None once split into fields or if built from fields
+        self._line: typing.Optional[str] = fromstr
+        # index, current_wp, coord_frame, command, param1 ... param7, autocontinue
+        self._fields: typing.Optional[typing.List[str]] = None
+        # param5, param6 and param7 as floats
+        self._numbers: typing.Optional[typing.Tuple[float, float, float]] = None
+
         if fromstr is None:
-            self._index = index
-            self._current_wp = current_wp
-            self._coord_frame = coord_frame
-            self._command = command
-            self._params = [param1, param2, param3, param4, param5, param6, param7]
-            self._autocontinue = autocontinue
-        else:
-            if fromstr.endswith('\n'):
-                _line = fromstr.strip('\n')
-            else:
-                _line = fromstr
-            _fields = _line.split(MavlinkParameters.SEPARATOR)
+            self._fields = [index, current_wp, coord_frame, command, param1, param2, param3, param4, param5, param6,
+                            param7, autocontinue]
 
-            self._index = _fields[0]
-            self._current_wp = _fields[1]
-            self._coord_frame = _fields[2]
-            self._command = _fields[3]
-            self._params = _fields[4:11]
-            self._autocontinue = _fields[11]
+    @classmethod
+    def from_lines(cls, lines: typing.Iterable[str]) -> typing.List[MissionItem]:
+        """
+        Builds an item from every line, skipping __init__: only the line is stored, it is split when first accessed.
+        """
+        _new = cls.__new__
+        _items = []
+        for _ii_line in lines:
+            _item = _new(cls)
+            _item._line = _ii_line
+            _item._fields = None
+            _item._numbers = None
+            _items.append(_item)
+        return _items
+
+    def _split(self) -> typing.List[str]:
+        if self._fields is None:
+            self._fields = self._line.strip('\n').split(MavlinkParameters.SEPARATOR)
+            self._line = None
+        return self._fields
+
+    def _parse_numbers(self) -> typing.Tuple[float, float, float]:
+        if self._numbers is None:
+            _fields = self._split()
+            self._numbers = float(_fields[8]), float(_fields[9]), float(_fields[10])
+        return self._numbers
 
     def valid_home(self):
-        if self._command == MavlinkParameters.MAV_CMD_NAV_WAYPOINT and \
-                self._current_wp == '1' and \
-                all(self._params[-3:]) and \
-                self._autocontinue == '1':
+        _fields = self._split()
+        if _fields[3] == MavlinkParameters.MAV_CMD_NAV_WAYPOINT and \
+                _fields[1] == '1' and \
+                all(_fields[8:11]) and \
+                _fields[11] == '1':
             return True
         else:
             return False
 
     def to_list(self):
-        _list = [self._index, self._current_wp, self._coord_frame, self._command, *self._params, self._autocontinue]
-        return _list
+        return list(self._split())
 
     def __str__(self):
-        return MavlinkParameters.SEPARATOR.join(self.to_list())+'\n'
+        if self._line is not None:
+            return self._line.strip('\n') + '\n'
+        return MavlinkParameters.SEPARATOR.join(self._fields)+'\n'
 
     @property
     def coordinates(self):
-        _lat = float(self._params[-3])
-        _lon = float(self._params[-2])
-        if self._command == MavlinkParameters.MAV_CMD_NAV_WAYPOINT:
-            _elevation = float(self._params[-1])
-        else:
+        _lat, _lon, _elevation = self._parse_numbers()
+        if self.command != MavlinkParameters.MAV_CMD_NAV_WAYPOINT:
             _elevation = None
         return _lat, _lon, _elevation
 
+    @property
+    def sequence(self) -> int:
+        """
+        param7 as an integer: the item's sequence number within its fence zone
+        """
+        return int(self._parse_numbers()[2])
+
     @property
     def index(self):
-        return self._index
+        return self._split()[0]
 
     @property
     def current_wp(self):
-        return self._current_wp
+        return self._split()[1]
 
     @property
     def coord_frame(self):
-        return self._coord_frame
+        return self._split()[2]
 
     @property
     def command(self):
-        return self._command
+        return self._split()[3]
 
     @property
     def params(self):
-        return self._params
+        return self._split()[4:11]
 
     @property
     def autocontinue(self):
-        return self._autocontinue
+        return self._split()[11]
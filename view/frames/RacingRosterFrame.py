@@ -14,14 +14,26 @@ class RacingRosterFrame(RowFrame):
 
         self.controller = race_controller
 
+        self._player_rows = {}
         racers = self.controller.get_players_list()
         for ii_racer in racers:
-            self.add_row(PlayerRow(self.frame, ii_racer, self.controller))
+            self._player_rows[ii_racer.id] = PlayerRow(self.frame, ii_racer, self.controller)
+            self.add_row(self._player_rows[ii_racer.id])
 
         self.pack_rows()
         self.update_rows()
         self.pack_frame()
 
+    def update_positions(self):
+        for ii_row in self.rows_list:
+            ii_row.update_position()
+
+        # Only repack the rows if the order changed
+        _ordered_rows = [self._player_rows[ii_id] for ii_id in self.controller.get_ranking()
+                         if ii_id in self._player_rows]
+        if _ordered_rows != self.rows_list:
+            self.reorder_rows(_ordered_rows)
+
 
 class PlayerRow(RowFrameRow):
     default_player_icon_path = os.path.join(ASSETS_DIR, 'user_default.png')
@@ -54,6 +66,9 @@ class PlayerRow(RowFrameRow):
 
         self.pack_frame()
 
+    def update_position(self):
+        self.race_position_label_var.set(f'#{self.controller.get_position(self._racer.id)}')
+
 
 if __name__ == '__main__':
     from view.MyTk import Window
@@ -1,4 +1,6 @@
 from view.frames.BasicFrame import BasicFrame
+from model.TrackCatalog import TrackCatalog
+from model.managers.TrackManager import TrackManager
 import tkinter.ttk as ttk
 import tkinter as tk
 
@@ -15,6 +17,17 @@ class TrackSelectionFrame(BasicFrame):
         self.scrollbar_frame_class = ScrollbarFrame(self.frame)
         self.place_in_grid(self.scrollbar_frame_class.frame, (0, 4), (7, 15))
 
+        # Circuits listed from the catalog index, only changed files are parsed, into the cache select_track uses
+        self.track_catalog = TrackCatalog(track_cache=TrackManager.get_track_cache())
+        self.update_tracks()
+
+    def update_tracks(self):
+        self.scrollbar_frame_class.set_tracks(self.track_catalog.refresh())
+
+    @property
+    def selected_track(self):
+        return self.scrollbar_frame_class.selected_track
+
 
 class ScrollbarFrame(BasicFrame):
     def __init__(self, master=None):
@@ -28,6 +41,26 @@ class ScrollbarFrame(BasicFrame):
         self.track_frame = ttk.LabelFrame(self.frame, text='TRACKS')
         self.track_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=5)
 
+        # Track list
+        self.track_list = ttk.Treeview(self.track_frame, columns=('length', 'checkpoints'), selectmode='browse',
+                                       yscrollcommand=self.track_scrollbar.set)
+        self.track_list.heading('#0', text='CIRCUIT')
+        self.track_list.heading('length', text='LENGTH (m)')
+        self.track_list.heading('checkpoints', text='CHECKPOINTS')
+        self.track_list.pack(fill=tk.BOTH, expand=True)
+        self.track_scrollbar.configure(command=self.track_list.yview)
+
+    @property
+    def selected_track(self):
+        _selection = self.track_list.selection()
+        return _selection[0] if _selection else None
+
+    def set_tracks(self, tracks):
+        self.track_list.delete(*self.track_list.get_children())
+        for _track in tracks:
+            self.track_list.insert('', tk.END, iid=_track.name, text=_track.name,
+                                   values=(f'{_track.track_length:.1f}', _track.checkpoint_count))
+
 
 if __name__ == '__main__':
     import view.MyTk as MyTk
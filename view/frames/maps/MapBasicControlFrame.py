@@ -27,11 +27,38 @@ class MapBasicControlFrame(BasicFrame):
         self.tile_set_dropdown.set_menu('SELECT TILE SET', *dropdown_vals)
         self.tile_set_dropdown.pack()
 
+        # Fence zones are drawn simplified for the current zoom level, and redrawn when the level changes
+        self._zone_polygons = []
+        self._zone_zoom = None
+        for _sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>', '<ButtonRelease-1>'):
+            self.map_view.canvas.bind(_sequence, self.on_zoom_change, add='+')
+
     def on_tile_set_change(self, event=None):
         # event = selected string
         _tile_server, _max_zoom = Tiles.get_tile_server(event)
         self.map_view.set_tile_server(tile_server=_tile_server, max_zoom=_max_zoom)
         self.map_view.set_zoom(self.map_view.max_zoom)
+        self.on_zoom_change()
+
+    def draw_zone_polygon(self, zone, **kwargs):
+        """
+        Draws a FenceZone with only the vertices visible at the current zoom level.
+        :param kwargs: set_polygon keyword arguments (palette)
+        """
+        self._zone_zoom = round(self.map_view.zoom)
+        _polygon = self.map_view.set_polygon(zone.simplified(self._zone_zoom), **kwargs)
+        self._zone_polygons.append((zone, kwargs, _polygon))
+
+    def on_zoom_change(self, event=None):
+        if round(self.map_view.zoom) == self._zone_zoom:
+            return
+
+        # Zones deleted by a full redraw are forgotten, the rest are drawn again for the new level
+        _zone_polygons = [_ii_entry for _ii_entry in self._zone_polygons if not _ii_entry[2].deleted]
+        self._zone_polygons = []
+        for _zone, _kwargs, _polygon in _zone_polygons:
+            _polygon.delete()
+            self.draw_zone_polygon(_zone, **_kwargs)
 
 
 class MapFenceLoader(ABC):
@@ -60,10 +60,8 @@ class MapFenceLoaderControlFrame(MapFenceLoader, MapBasicControlFrame):
         else:
             _zone_kwargs = POLYGON_EXCLUSION_KWARGS
 
-        # Polygon coordinate list
-        _zone_coordinates = zone.tuple_list
-
-        self.map_view.set_polygon(_zone_coordinates, **_zone_kwargs)
+        # Polygon coordinates, simplified for the current zoom level
+        self.draw_zone_polygon(zone, **_zone_kwargs)
 
     def draw_home(self, home: Vertex):
         self.map_view.set_marker(home.lat, home.lon, text='HOME')
@@ -217,6 +215,11 @@ class MapFenceCheckpointControlFrame(MapFenceLoaderControlFrame):
                                               command=self.generate_div_button_click)
         self.pack_widget(self.generate_div_button, 'left', 2)
 
+        # Generate centerline checkpoints button
+        self.generate_centerline_div_button = ttk.Button(self.frame, text='Generate Centerline Checkpoints',
+                                                         command=self.generate_centerline_div_button_click)
+        self.pack_widget(self.generate_centerline_div_button, 'left', 2)
+
         # Clear checkpoints button
         self.clear_div_button = ttk.Button(self.frame, text='Clear Checkpoints', command=self.clear_div_button_click)
         self.pack_widget(self.clear_div_button, 'left', 2)
@@ -232,15 +235,17 @@ class MapFenceCheckpointControlFrame(MapFenceLoaderControlFrame):
     def draw_checkpoints(self):
         _checkpoints = self.controller.get_checkpoints()
 
-        for ii_checkpoint in _checkpoints:
-            _endpoints = ii_checkpoint.endpoints
-            _path_list = [jj_endpoint.tuple for jj_endpoint in _endpoints]
+        for _path_list in _checkpoints.endpoints.tolist():
             self.map_view.set_path(_path_list)
 
     def generate_div_button_click(self):
         self.controller.create_checkpoints()
         self.draw_update()
 
+    def generate_centerline_div_button_click(self):
+        self.controller.create_centerline_checkpoints()
+        self.draw_update()
+
     def clear_div_button_click(self):
         self.controller.create_checkpoints()
         self.draw_update()
@@ -81,9 +81,7 @@ class MapRaceControlFrame(MapBasicControlFrame):
     def draw_checkpoints(self):
         _checkpoints = self.controller.get_checkpoints()
 
-        for ii_checkpoint in _checkpoints:
-            _endpoints = ii_checkpoint.endpoints
-            _path_list = [jj_endpoint.tuple for jj_endpoint in _endpoints]
+        for _path_list in _checkpoints.endpoints.tolist():
             self.map_view.set_path(_path_list)
 
     def draw_map(self):
@@ -107,10 +105,8 @@ class MapRaceControlFrame(MapBasicControlFrame):
         else:
             _zone_kwargs = POLYGON_EXCLUSION_KWARGS
 
-        # Polygon coordinate list
-        _zone_coordinates = zone.tuple_list
-
-        self.map_view.set_polygon(_zone_coordinates, **_zone_kwargs)
+        # Polygon coordinates, simplified for the current zoom level
+        self.draw_zone_polygon(zone, **_zone_kwargs)
 
     def draw_starting_points(self):
         # Draw starting points